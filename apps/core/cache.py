@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import time
+from typing import Any, Callable
+
+import redis
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+_LOCKED = object()
+
+
+def _version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def namespace_version(namespace: str) -> int:
+    """Returns the current version of `namespace`, initializing it if needed."""
+
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        # start from the clock rather than 1, so an evicted version never comes
+        # back as one that older entries are still stored under
+        cache.add(_version_key(namespace), time.time_ns(), timeout=None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def make_key(namespace: str, *parts: str) -> str:
+    """
+    Builds a key for `parts` under the current version of `namespace`. Raises
+    `redis.RedisError` when the version can't be read.
+    """
+
+    digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()
+    return f"{namespace}:v{namespace_version(namespace)}:{digest}"
+
+
+def invalidate(namespace: str) -> None:
+    """
+    Invalidates every key of `namespace` by bumping its version. When the
+    cache is unavailable the stale keys are left to expire.
+    """
+
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        # nothing was cached under this namespace yet
+        _ignore_cache_errors(namespace_version, namespace)
+    except redis.RedisError:
+        logger.warning(f"Couldn't invalidate cache of {namespace}.", exc_info=True)
+
+
+def invalidate_on_commit(namespace: str) -> None:
+    """
+    Invalidates `namespace` once the current transaction commits, so no reader
+    can repopulate the new version from a snapshot without the change.
+    """
+
+    transaction.on_commit(lambda: invalidate(namespace))
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: float,
+    lock_timeout: float = LOCK_TIMEOUT,
+) -> Any:
+    """
+    Returns the value cached under `key`, computing and caching it on a miss.
+
+    Only one caller recomputes a missing key at a time (single flight): the
+    others wait for its result for up to `lock_timeout` seconds before falling
+    back to computing the value themselves. The value is computed uncached
+    when the cache is unavailable.
+    """
+
+    lock_key = f"{key}:lock"
+    try:
+        value = _get_or_lock(key, lock_key, lock_timeout)
+    except redis.RedisError:
+        logger.warning(f"Cache unavailable, computing {key}.", exc_info=True)
+        return compute()
+    if value is None:
+        return compute()
+    if value is not _LOCKED:
+        return value
+
+    try:
+        value = compute()
+        _ignore_cache_errors(cache.set, key, value, timeout=timeout)
+        return value
+    finally:
+        # left to expire after `lock_timeout` if it can't be deleted
+        _ignore_cache_errors(cache.delete, lock_key)
+
+
+def _get_or_lock(key: str, lock_key: str, lock_timeout: float) -> Any:
+    """
+    Returns the value cached under `key`, `_LOCKED` once the caller holds
+    `lock_key` to compute it, or None if no value showed up in time.
+    """
+
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        if cache.add(lock_key, 1, timeout=lock_timeout):
+            return _LOCKED
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _ignore_cache_errors(operation: Callable, *args, **kwargs) -> None:
+    try:
+        operation(*args, **kwargs)
+    except redis.RedisError:
+        logger.warning("Cache write failed.", exc_info=True)
@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def _pin_key(user_id: int) -> str:
+    return f"db:pinned:{user_id}"
+
+
+@contextmanager
+def replica_reads():
+    """Routes the reads made in the block to the replicas, if any."""
+
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads_enabled() -> bool:
+    return _replica_reads.get()
+
+
+def pin_to_primary(user_id: int) -> None:
+    """
+    Keeps the reads of `user_id` on the primary for `DB_REPLICA_PIN_SECONDS`,
+    so they see their own writes while the replicas catch up.
+    """
+
+    if settings.DATABASE_REPLICAS:
+        cache.set(_pin_key(user_id), True, timeout=settings.DB_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id: int) -> bool:
+    return bool(cache.get(_pin_key(user_id)))
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    """
+    Returns the statistics of the connection pools of the current process by
+    database alias, see psycopg_pool's `get_stats`. `requests_wait_ms` is the
+    total time requests waited for a connection, `requests_waiting` how many
+    are waiting right now; `requests_wait_avg_ms` is added for convenience.
+    """
+
+    stats = {}
+    for connection in connections.all():
+        pool = getattr(connection, "pool", None)
+        if pool is None:
+            continue
+        alias_stats = pool.get_stats()
+        # counters are only reported once they are non zero
+        requests = alias_stats.get("requests_num", 0)
+        alias_stats["requests_wait_avg_ms"] = (
+            alias_stats.get("requests_wait_ms", 0) // requests if requests else 0
+        )
+        stats[connection.alias] = alias_stats
+    return stats
@@ -0,0 +1,134 @@
+import logging
+import os
+import smtplib
+import threading
+import time
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+class PooledEmailConnection:
+    """
+    A long-lived email connection shared by everything sending mail in the
+    current process.
+
+    Django's `send_mail` opens and tears down an SMTP (and TLS) session per
+    call. This keeps one backend connection open between sends instead:
+    it is probed with NOOP after `keepalive_interval` seconds of inactivity,
+    dropped after `idle_timeout` seconds so servers don't cut it under us, and
+    transparently reopened once if the server hung up, resuming from the
+    message it hung up on.
+
+    Can be passed anywhere Django expects an email `connection`.
+    """
+
+    reconnect_errors = (smtplib.SMTPServerDisconnected, ConnectionError)
+
+    def __init__(self, idle_timeout: float, keepalive_interval: float):
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._backend = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def send_messages(self, email_messages) -> int:
+        if not email_messages:
+            return 0
+
+        with self._lock:
+            backend = self._acquire()
+            sent = 0
+            reconnected = False
+            # one at a time, so a batch the server hung up on is resumed from
+            # the message that failed rather than sent again from the start
+            for message in email_messages:
+                try:
+                    sent += backend.send_messages([message])
+                except self.reconnect_errors as e:
+                    if reconnected:
+                        raise
+                    logger.warning(f"Email connection lost ({e}), reconnecting.")
+                    self._discard()
+                    reconnected = True
+                    backend = self._acquire()
+                    sent += backend.send_messages([message])
+            self._last_used = time.monotonic()
+            return sent
+
+    def __deepcopy__(self, memo):
+        # messages keep a reference to their connection and get copied by
+        # some backends, the shared connection itself must never be copied
+        return self
+
+    def close(self) -> None:
+        """Closes the connection gracefully."""
+
+        with self._lock:
+            if self._backend is not None:
+                try:
+                    self._backend.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close email connection: {e}")
+                self._backend = None
+
+    def reset(self) -> None:
+        """
+        Forgets the connection without talking to the server, e.g. in a forked
+        child that must not share its parent's socket.
+        """
+
+        self._backend = None
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        idle = time.monotonic() - self._last_used
+        if self._backend is not None:
+            if idle > self.idle_timeout:
+                self._discard()
+            elif idle > self.keepalive_interval and not self._is_alive():
+                self._discard()
+
+        if self._backend is None:
+            self._backend = get_connection(fail_silently=False)
+            # An explicitly opened backend is not closed by `send_messages`.
+            self._backend.open()
+            logger.info("Opened pooled email connection.")
+        return self._backend
+
+    def _is_alive(self) -> bool:
+        connection = getattr(self._backend, "connection", None)
+        if connection is None:
+            # non-SMTP backends (console, locmem, ...) have nothing to probe
+            return True
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _discard(self) -> None:
+        if self._backend is None:
+            return
+        try:
+            self._backend.close()
+        except Exception:
+            # the connection is being thrown away anyway
+            pass
+        self._backend = None
+
+
+email_connection = PooledEmailConnection(
+    idle_timeout=settings.EMAIL_CONNECTION_IDLE_TIMEOUT,
+    keepalive_interval=settings.EMAIL_CONNECTION_KEEPALIVE_INTERVAL,
+)
+
+# prefork pool children must open their own connection
+os.register_at_fork(after_in_child=email_connection.reset)
+
+
+@worker_process_shutdown.connect
+def close_email_connection(**kwargs):
+    email_connection.close()
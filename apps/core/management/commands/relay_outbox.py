@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.outbox import RELAY_BATCH_SIZE, relay_pending
+
+
+class Command(BaseCommand):
+    help = "Publishes pending outbox messages to Celery."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RELAY_BATCH_SIZE,
+            help="Maximum number of messages published per batch.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit instead of polling.",
+        )
+
+    def handle(self, *args, batch_size, interval, once, **options):
+        while True:
+            relayed = relay_pending(batch_size)
+            if relayed == batch_size:
+                continue
+            if once:
+                return
+            time.sleep(interval)
@@ -0,0 +1,25 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from .db import pin_to_primary
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pins the user of every unsafe request to the primary for a while, see
+    `apps.core.db.pin_to_primary`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # DRF sets the user it authenticated on the request as well
+        user = getattr(request, "user", None)
+        if (
+            request.method not in SAFE_METHODS
+            and user is not None
+            and user.is_authenticated
+        ):
+            pin_to_primary(user.pk)
+        return response
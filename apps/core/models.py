@@ -11,3 +11,27 @@ class TimeStampModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task call recorded in the same transaction as the change that
+    caused it. Pending rows are published to the broker by the outbox relay
+    (see `apps.core.outbox`), so nothing is sent for rolled back transactions.
+    """
+
+    task_name = models.CharField(
+        max_length=255, help_text="Registered name of the Celery task."
+    )
+    kwargs = models.JSONField(
+        default=dict, help_text="Keyword arguments the task is called with."
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, help_text="Date and time when the message was stored."
+    )
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"OutboxMessage #{self.pk} {self.task_name}"
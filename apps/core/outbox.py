@@ -0,0 +1,50 @@
+import logging
+
+from celery import current_app
+from django.db import transaction
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+RELAY_BATCH_SIZE = 500
+
+
+def publish(task, **kwargs) -> OutboxMessage:
+    """
+    Schedules `task` to be called with `kwargs` by writing it to the outbox.
+    Call it inside the transaction that makes the change being announced:
+    the message becomes visible to the relay only once that transaction commits.
+    """
+
+    return OutboxMessage.objects.create(task_name=task.name, kwargs=kwargs)
+
+
+def relay_pending(batch_size: int = RELAY_BATCH_SIZE) -> int:
+    """
+    Publishes up to `batch_size` pending outbox messages to the broker over a
+    single producer connection and removes them from the outbox.
+    Rows locked by a concurrent relay are skipped, so relays can run in parallel.
+    Delivery is at-least-once: a crash between publishing and committing
+    republishes the batch on the next run.
+    """
+
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not messages:
+            return 0
+
+        with current_app.producer_or_acquire() as producer:
+            for message in messages:
+                current_app.send_task(
+                    message.task_name, kwargs=message.kwargs, producer=producer
+                )
+
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in messages]
+        ).delete()
+
+    logger.info(f"Relayed {len(messages)} outbox messages.")
+    return len(messages)
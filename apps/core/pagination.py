@@ -0,0 +1,181 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination.
+
+    Unlike the offset-based `CursorPagination`, the cursor stores the full
+    ordering key of the boundary row plus a unique tiebreaker, so every page is
+    resolved with a single indexed range scan, no matter how deep it is and
+    no matter how many rows share the same ordering value.
+    """
+
+    ordering = ("-created_at",)
+    tiebreaker = "pk"
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+    # Opts a request into cursor mode on views that keep offset pagination
+    # as the default (see `is_requested`).
+    mode_query_param = "pagination"
+    mode_query_value = "cursor"
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        """Tells whether the request asks for keyset pagination."""
+
+        params = request.query_params
+        return (
+            cls.cursor_query_param in params
+            or params.get(cls.mode_query_param) == cls.mode_query_value
+        )
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if self.tiebreaker not in (field.lstrip("-") for field in ordering):
+            direction = "-" if ordering[0].startswith("-") else ""
+            ordering += (direction + self.tiebreaker,)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor["reverse"]
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(
+                    self._get_seek_filter(self.cursor["position"], reverse)
+                )
+            except (ValidationError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # Fetch one extra row to find out whether there is a following page.
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_following = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            # An empty reversed page means we stepped back past the first row,
+            # so the next page starts right where the cursor pointed.
+            position = self.cursor["position"]
+        return self.encode_cursor({"position": position, "reverse": False})
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor["position"]
+        return self.encode_cursor({"position": position, "reverse": True})
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            cursor = {
+                "position": tokens["p"],
+                "reverse": bool(tokens.get("r", False)),
+            }
+            ordering = tuple(tokens["o"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # A cursor is only meaningful for the ordering it was produced with.
+        position = cursor["position"]
+        if (
+            ordering != self.ordering
+            or not isinstance(position, list)
+            or len(position) != len(ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return cursor
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": cursor["position"], "o": self.ordering}
+        if cursor["reverse"]:
+            tokens["r"] = 1
+        encoded = urlsafe_b64encode(json.dumps(tokens).encode()).decode("ascii")
+        url = replace_query_param(self.base_url, self.cursor_query_param, encoded)
+        return replace_query_param(url, self.mode_query_param, self.mode_query_value)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for order in ordering:
+            field_name = order.lstrip("-")
+            field = instance._meta.get_field(
+                instance._meta.pk.name if field_name == "pk" else field_name
+            )
+            position.append(field.value_to_string(instance))
+        return position
+
+    def _get_seek_filter(self, position, reverse: bool) -> Q:
+        """
+        Builds the lexicographic "row comes after position" filter, e.g. for
+        ("-price", "-pk"): price <= p0 AND (price < p0 OR (price = p0 AND pk < p1)).
+        The redundant leading bound lets the planner use a plain index range scan.
+        """
+
+        conditions = []
+        equal = Q()
+        for order, value in zip(self.ordering, position):
+            field_name = order.lstrip("-")
+            descending = order.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            conditions.append(equal & Q(**{f"{field_name}__{lookup}": value}))
+            equal &= Q(**{field_name: value})
+
+        first_order, first_value = self.ordering[0], position[0]
+        lookup = "lte" if first_order.startswith("-") != reverse else "gte"
+        leading_bound = Q(**{f"{first_order.lstrip('-')}__{lookup}": first_value})
+        return leading_bound & reduce(or_, conditions)
+
+
+def _reverse_ordering(ordering):
+    return tuple(
+        order[1:] if order.startswith("-") else "-" + order for order in ordering
+    )
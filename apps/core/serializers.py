@@ -0,0 +1,183 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+
+
+class SparseFieldsetsMixin:
+    """
+    Lets read requests pick the fields of the representation with
+    `?fields=a,b` (only these) and/or `?omit=c` (all but these).
+
+    Only applies to safe methods, the fields written and returned by other
+    requests don't change. Unknown field names are a 400.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        fields = self._requested_fields(request, self.fields_query_param)
+        omit = self._requested_fields(request, self.omit_query_param)
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+    def _requested_fields(self, request, param: str) -> set[str]:
+        value = request.query_params.get(param, "")
+        names = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = names - set(self.fields)
+        if unknown:
+            raise ValidationError(
+                {param: f"Unknown fields: {', '.join(sorted(unknown))}."}
+            )
+        return names
+
+
+class ExpandableFieldsMixin:
+    """
+    Lets read requests inline related objects in place of their ids with
+    `?expand=a,b`, for the fields of `expandable_fields`, a mapping of field
+    names to the serializer of the related object.
+
+    The related objects should be loaded along with the instances, see
+    `apps.core.views.ExpandRelatedMixin`. Unknown field names are a 400.
+    """
+
+    expand_query_param = "expand"
+    expandable_fields: dict[str, type[serializers.Serializer]] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+
+        for name in self.requested_expansions(request):
+            self.fields[name] = self.expandable_fields[name](read_only=True)
+
+    @classmethod
+    def requested_expansions(cls, request) -> list[str]:
+        if request.method not in SAFE_METHODS:
+            return []
+
+        value = request.query_params.get(cls.expand_query_param, "")
+        names = list(dict.fromkeys(n.strip() for n in value.split(",") if n.strip()))
+        unknown = set(names) - set(cls.expandable_fields)
+        if unknown:
+            raise ValidationError(
+                {
+                    cls.expand_query_param: "Unknown fields: "
+                    f"{', '.join(sorted(unknown))}."
+                }
+            )
+        return names
+
+
+# builtins doing what these `to_representation` do, without the method call
+_BUILTIN_CONVERTERS = {
+    serializers.CharField.to_representation: str,
+    serializers.IntegerField.to_representation: int,
+}
+
+
+def _datetime_converter(field: serializers.DateTimeField):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = (
+        field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    )
+    if (
+        output_format is None
+        or output_format.lower() != ISO_8601
+        or field_timezone is None
+    ):
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+def _converter(field):
+    """
+    Returns the function representing a database value of the field, None if
+    the value is represented as is.
+    """
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # the database value is the primary key the field represents
+        return field.pk_field.to_representation if field.pk_field else None
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    return _BUILTIN_CONVERTERS.get(
+        type(field).to_representation, field.to_representation
+    )
+
+
+class ValuesRepresentation:
+    """
+    Builds the representation of a read only `serializer` straight from
+    `values_list(*columns)` rows, skipping model instances and the per field
+    `to_representation` machinery. The output is identical to the
+    serializer's.
+
+    Compiled per request with `compile`, which returns None for serializers it
+    can't represent: nested serializers, method fields, dotted sources...
+    """
+
+    def __init__(self, names: list[str], columns: list[str], converters: list):
+        self.names = names
+        self.columns = columns
+        self.converters = converters
+
+    @classmethod
+    def compile(cls, serializer, queryset) -> "ValuesRepresentation | None":
+        names, columns, converters = [], [], []
+        opts = queryset.model._meta
+        for field in serializer._readable_fields:
+            if isinstance(
+                field,
+                (
+                    serializers.BaseSerializer,
+                    serializers.ManyRelatedField,
+                    serializers.SerializerMethodField,
+                ),
+            ) or (
+                isinstance(field, serializers.RelatedField)
+                and not isinstance(field, serializers.PrimaryKeyRelatedField)
+            ):
+                return None
+
+            source = field.source
+            if source not in queryset.query.annotations:
+                try:
+                    model_field = opts.get_field(source)
+                except FieldDoesNotExist:
+                    return None
+                if not model_field.concrete or model_field.many_to_many:
+                    return None
+
+            names.append(field.field_name)
+            columns.append(source)
+            converters.append(_converter(field))
+        return cls(names, columns, converters)
+
+    def to_representation(self, rows) -> list[dict]:
+        fields = list(zip(self.names, self.converters))
+        return [
+            {
+                name: value if convert is None or value is None else convert(value)
+                for (name, convert), value in zip(fields, row)
+            }
+            for row in rows
+        ]
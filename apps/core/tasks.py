@@ -2,7 +2,9 @@ import logging
 
 from celery import shared_task
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, send_mail
+
+from .mail import email_connection
 
 logger = logging.getLogger(__name__)
 
@@ -13,14 +15,67 @@ logger = logging.getLogger(__name__)
     retry_backoff=True,
 )
 def send_email_notification(subject, message, recipient_list) -> None:
-    """Sends an email to a list of recipients with logging and retry logic."""
+    """
+    Sends an email to a list of recipients with logging and retry logic,
+    reusing the worker's pooled email connection.
+    """
 
     logger.info(
         f"Attempting to send email to {recipient_list} with subject: '{subject}'"
     )
     try:
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, recipient_list)
+        send_mail(
+            subject,
+            message,
+            settings.DEFAULT_FROM_EMAIL,
+            recipient_list,
+            connection=email_connection,
+        )
         logger.info(f"Successfully sent email to {recipient_list}.")
     except Exception as e:
         logger.error(f"Failed to send email to {recipient_list}. Error: {e}")
         raise
+
+
+@shared_task(bind=True, max_retries=3)
+def send_mass_email_notification(self, subject, message, recipient_list) -> None:
+    """
+    Sends the same email separately to every recipient over a single SMTP
+    connection, so recipients don't see each other's addresses.
+
+    A failed send is retried for the recipients that weren't sent the email
+    yet only, the ones before it aren't sent it again.
+    """
+
+    logger.info(
+        f"Attempting to send email to {len(recipient_list)} recipients "
+        f"with subject: '{subject}'"
+    )
+    for sent, recipient in enumerate(recipient_list):
+        try:
+            EmailMessage(
+                subject,
+                message,
+                settings.DEFAULT_FROM_EMAIL,
+                [recipient],
+                connection=email_connection,
+            ).send()
+        except Exception as e:
+            remaining = recipient_list[sent:]
+            logger.error(
+                f"Failed to send emails with subject: '{subject}' after {sent} "
+                f"sent, {len(remaining)} left. Error: {e}"
+            )
+            raise self.retry(
+                exc=e,
+                args=(),
+                kwargs={
+                    "subject": subject,
+                    "message": message,
+                    "recipient_list": remaining,
+                },
+                countdown=2**self.request.retries,
+            )
+    logger.info(
+        f"Successfully sent {len(recipient_list)} emails with subject: '{subject}'."
+    )
@@ -0,0 +1,83 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+import redis
+from django.core.cache import cache as django_cache
+
+from apps.core import cache
+
+
+def test_make_key_changes_after_invalidate():
+    key = cache.make_key("test", "a")
+
+    cache.invalidate("test")
+
+    assert cache.make_key("test", "a") != key
+    assert cache.make_key("test", "a") == cache.make_key("test", "a")
+
+
+def test_get_or_compute_caches_value():
+    compute = Mock(return_value="value")
+
+    assert cache.get_or_compute("key", compute, timeout=60) == "value"
+    assert cache.get_or_compute("key", compute, timeout=60) == "value"
+    compute.assert_called_once()
+
+
+def test_get_or_compute_waits_for_concurrent_recompute():
+    django_cache.add("key:lock", 1)
+    threading.Timer(0.1, django_cache.set, args=("key", "computed")).start()
+    compute = Mock(return_value="value")
+
+    assert cache.get_or_compute("key", compute, timeout=60) == "computed"
+    compute.assert_not_called()
+
+
+def test_get_or_compute_falls_back_when_lock_is_not_released():
+    django_cache.add("key:lock", 1)
+    compute = Mock(return_value="value")
+
+    value = cache.get_or_compute("key", compute, timeout=60, lock_timeout=0.1)
+
+    assert value == "value"
+    compute.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_invalidate_on_commit(django_capture_on_commit_callbacks):
+    key = cache.make_key("test", "a")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cache.invalidate_on_commit("test")
+        assert cache.make_key("test", "a") == key
+
+    assert cache.make_key("test", "a") != key
+
+
+def test_invalidate_survives_cache_errors(caplog):
+    with patch.object(django_cache, "incr", side_effect=redis.ConnectionError):
+        cache.invalidate("test")
+
+    assert "Couldn't invalidate cache of test." in caplog.text
+
+
+def test_get_or_compute_without_cache():
+    compute = Mock(return_value="value")
+
+    with patch.object(django_cache, "get", side_effect=redis.ConnectionError):
+        assert cache.get_or_compute("key", compute, timeout=60) == "value"
+
+    compute.assert_called_once()
+
+
+def test_get_or_compute_survives_failing_writes():
+    compute = Mock(return_value="value")
+
+    with (
+        patch.object(django_cache, "set", side_effect=redis.ConnectionError),
+        patch.object(django_cache, "delete", side_effect=redis.ConnectionError),
+    ):
+        assert cache.get_or_compute("key", compute, timeout=60) == "value"
+
+    compute.assert_called_once()
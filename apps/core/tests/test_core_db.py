@@ -0,0 +1,35 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from apps.core.db import pool_stats
+
+
+@pytest.mark.django_db
+def test_pool_stats(settings):
+    connection.ensure_connection()
+
+    stats = pool_stats()
+
+    pool_options = settings.DATABASES["default"]["OPTIONS"]["pool"]
+    assert stats["default"]["pool_max"] == pool_options["max_size"]
+    assert stats["default"]["requests_wait_avg_ms"] >= 0
+
+
+@pytest.mark.django_db
+def test_db_pool_stats_view(api_client, user_factory):
+    api_client.force_authenticate(user_factory(is_staff=True))
+
+    response = api_client.get(reverse("core:db-pool-stats"))
+
+    assert response.status_code == 200
+    assert "default" in response.data
+
+
+@pytest.mark.django_db
+def test_db_pool_stats_view_requires_admin(api_client, client_user):
+    api_client.force_authenticate(client_user)
+
+    response = api_client.get(reverse("core:db-pool-stats"))
+
+    assert response.status_code == 403
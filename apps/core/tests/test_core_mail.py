@@ -0,0 +1,95 @@
+import smtplib
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.mail import EmailMessage
+
+from apps.core.mail import PooledEmailConnection
+
+
+def _message():
+    return EmailMessage("Subject", "Message", "from@a.com", ["to@a.com"])
+
+
+@patch("apps.core.mail.get_connection")
+def test_pooled_connection_is_reused(mock_get_connection):
+    pool = PooledEmailConnection(idle_timeout=60, keepalive_interval=60)
+
+    pool.send_messages([_message()])
+    pool.send_messages([_message()])
+
+    mock_get_connection.assert_called_once()
+    mock_get_connection.return_value.open.assert_called_once()
+    assert mock_get_connection.return_value.send_messages.call_count == 2
+
+
+@patch("apps.core.mail.get_connection")
+def test_pooled_connection_reconnects_when_server_hung_up(mock_get_connection):
+    broken, fresh = MagicMock(), MagicMock()
+    broken.send_messages.side_effect = smtplib.SMTPServerDisconnected
+    mock_get_connection.side_effect = [broken, fresh]
+    pool = PooledEmailConnection(idle_timeout=60, keepalive_interval=60)
+
+    pool.send_messages([_message()])
+
+    broken.close.assert_called_once()
+    fresh.send_messages.assert_called_once()
+
+
+@patch("apps.core.mail.get_connection")
+def test_pooled_connection_resumes_batch_after_reconnect(mock_get_connection):
+    broken, fresh = MagicMock(), MagicMock()
+    broken.send_messages.side_effect = [1, smtplib.SMTPServerDisconnected]
+    fresh.send_messages.return_value = 1
+    mock_get_connection.side_effect = [broken, fresh]
+    pool = PooledEmailConnection(idle_timeout=60, keepalive_interval=60)
+    messages = [_message(), _message(), _message()]
+
+    sent = pool.send_messages(messages)
+
+    assert sent == 3
+    assert [call.args[0] for call in broken.send_messages.call_args_list] == [
+        [messages[0]],
+        [messages[1]],
+    ]
+    # the message accepted before the server hung up isn't sent again
+    assert [call.args[0] for call in fresh.send_messages.call_args_list] == [
+        [messages[1]],
+        [messages[2]],
+    ]
+
+
+@patch("apps.core.mail.get_connection")
+def test_pooled_connection_reconnects_once(mock_get_connection):
+    broken, fresh = MagicMock(), MagicMock()
+    broken.send_messages.side_effect = smtplib.SMTPServerDisconnected
+    fresh.send_messages.side_effect = [1, smtplib.SMTPServerDisconnected]
+    mock_get_connection.side_effect = [broken, fresh]
+    pool = PooledEmailConnection(idle_timeout=60, keepalive_interval=60)
+
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        pool.send_messages([_message(), _message()])
+
+    assert mock_get_connection.call_count == 2
+
+
+@patch("apps.core.mail.get_connection")
+def test_pooled_connection_is_dropped_after_idle_timeout(mock_get_connection):
+    pool = PooledEmailConnection(idle_timeout=0, keepalive_interval=0)
+
+    pool.send_messages([_message()])
+    pool.send_messages([_message()])
+
+    assert mock_get_connection.call_count == 2
+
+
+@patch("apps.core.mail.get_connection")
+def test_pooled_connection_probes_idle_connection(mock_get_connection):
+    mock_get_connection.return_value.connection.noop.return_value = (421, b"")
+    pool = PooledEmailConnection(idle_timeout=60, keepalive_interval=0)
+
+    pool.send_messages([_message()])
+    pool.send_messages([_message()])
+
+    mock_get_connection.return_value.connection.noop.assert_called_once()
+    assert mock_get_connection.call_count == 2
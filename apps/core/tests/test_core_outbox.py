@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import transaction
+
+from apps.core import outbox
+from apps.core.models import OutboxMessage
+from apps.core.tasks import send_email_notification
+
+
+@pytest.mark.django_db
+def test_publish_stores_task_call():
+    outbox.publish(
+        send_email_notification,
+        subject="Subject",
+        message="Message",
+        recipient_list=["test@example.com"],
+    )
+
+    message = OutboxMessage.objects.get()
+    assert message.task_name == send_email_notification.name
+    assert message.kwargs == {
+        "subject": "Subject",
+        "message": "Message",
+        "recipient_list": ["test@example.com"],
+    }
+
+
+@pytest.mark.django_db
+def test_publish_is_discarded_on_rollback():
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            outbox.publish(send_email_notification, subject="Subject")
+            raise RuntimeError
+
+    assert not OutboxMessage.objects.exists()
+
+
+@pytest.mark.django_db
+@patch("apps.core.outbox.current_app.send_task")
+def test_relay_pending_sends_and_removes_messages(mock_send_task):
+    for i in range(3):
+        outbox.publish(send_email_notification, subject=f"Subject {i}")
+
+    relayed = outbox.relay_pending(batch_size=2)
+
+    assert relayed == 2
+    assert mock_send_task.call_count == 2
+    assert mock_send_task.call_args_list[0].args == (send_email_notification.name,)
+    assert mock_send_task.call_args_list[0].kwargs["kwargs"] == {"subject": "Subject 0"}
+    assert OutboxMessage.objects.count() == 1
+
+
+@pytest.mark.django_db
+@patch("apps.core.outbox.current_app.send_task")
+def test_relay_pending_empty_outbox(mock_send_task):
+    assert outbox.relay_pending() == 0
+    mock_send_task.assert_not_called()
@@ -0,0 +1,238 @@
+"""
+Query budgets of every action of every viewset.
+
+Each case sets up the objects an action needs, performs it as a user allowed
+to, and asserts it succeeds within a fixed number of SQL queries. Adding an
+action to a viewset without a budget here fails `test_every_action_has_budget`.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.viewsets import ViewSetMixin
+
+from apps.proposals.models import Proposal
+from apps.tasks.models import Task
+from apps.users.models import User
+
+
+@dataclass
+class Case:
+    budget: int
+    method: str
+    # builds (user, url) from the fixtures
+    setup: Callable
+    data: dict = field(default_factory=dict)
+    status: int = 200
+
+
+def task_url(name, task=None):
+    return reverse(f"tasks:task-{name}", kwargs={"pk": task.pk} if task else None)
+
+
+def nested_url(resource, name, task, obj=None):
+    kwargs = {"task_pk": task.pk} | ({"pk": obj.pk} if obj else {})
+    return reverse(f"tasks:task-{resource}-{name}", kwargs=kwargs)
+
+
+def task_list(f):
+    for _ in range(3):
+        f.task_factory(freelancer=f.freelancer_user)
+    return None, task_url("list")
+
+
+def task_export(f):
+    task_list(f)
+    return f.client_user, task_url("export")
+
+
+def task_detail(status, user="client_user", name="detail"):
+    def setup(f):
+        task = f.task_factory(freelancer=f.freelancer_user, status=status)
+        return getattr(f, user), task_url(name, task)
+
+    return setup
+
+
+def proposal_list(f, name="list"):
+    task = f.task_factory()
+    for email in ("a@a.com", "b@b.com", "c@c.com"):
+        freelancer = f.user_factory(email=email, role=User.UserRole.FREELANCER)
+        Proposal.objects.create(task=task, freelancer=freelancer, message="Hi")
+    return f.client_user, nested_url("proposals", name, task)
+
+
+def proposal_create(f):
+    return f.freelancer_user, nested_url("proposals", "list", f.task_factory())
+
+
+def proposal_detail(user, name="detail"):
+    def setup(f):
+        proposal = f.proposal_factory()
+        return getattr(f, user), nested_url("proposals", name, proposal.task, proposal)
+
+    return setup
+
+
+def review_list(f):
+    review = f.review_factory()
+    return f.client_user, nested_url("reviews", "list", review.task)
+
+
+def review_detail(f):
+    review = f.review_factory()
+    return f.client_user, nested_url("reviews", "detail", review.task, review)
+
+
+def review_create(f):
+    task = f.task_factory(
+        freelancer=f.freelancer_user, status=Task.TaskStatus.COMPLETED
+    )
+    return f.freelancer_user, nested_url("reviews", "list", task)
+
+
+TASK_DATA = {
+    "title": "Updated Task",
+    "description": "Updated description",
+    "price": 150.00,
+    "deadline": "2099-12-31T23:59:59Z",
+}
+
+BUDGETS = {
+    ("TaskViewSet", "list"): Case(2, "get", task_list),
+    ("TaskViewSet", "retrieve"): Case(2, "get", task_detail(Task.TaskStatus.OPEN)),
+    ("TaskViewSet", "create"): Case(
+        5,
+        "post",
+        lambda f: (f.client_user, task_url("list")),
+        data=TASK_DATA,
+        status=201,
+    ),
+    ("TaskViewSet", "update"): Case(
+        2, "put", task_detail(Task.TaskStatus.OPEN), data=TASK_DATA
+    ),
+    ("TaskViewSet", "partial_update"): Case(
+        2, "patch", task_detail(Task.TaskStatus.OPEN), data={"title": "Patched"}
+    ),
+    ("TaskViewSet", "destroy"): Case(
+        6, "delete", task_detail(Task.TaskStatus.OPEN), status=204
+    ),
+    ("TaskViewSet", "start"): Case(
+        8,
+        "post",
+        task_detail(Task.TaskStatus.PAID, "freelancer_user", "start"),
+    ),
+    ("TaskViewSet", "submit"): Case(
+        8,
+        "post",
+        task_detail(Task.TaskStatus.IN_PROGRESS, "freelancer_user", "submit"),
+    ),
+    ("TaskViewSet", "approve_submission"): Case(
+        8,
+        "post",
+        task_detail(
+            Task.TaskStatus.PENDING_REVIEW, "client_user", "approve-submission"
+        ),
+    ),
+    ("TaskViewSet", "reject_submission"): Case(
+        8,
+        "post",
+        task_detail(Task.TaskStatus.PENDING_REVIEW, "client_user", "reject-submission"),
+    ),
+    ("TaskViewSet", "cancel"): Case(
+        7, "post", task_detail(Task.TaskStatus.OPEN, "client_user", "cancel")
+    ),
+    # the payment is claimed and its session stored in separate transactions
+    ("TaskViewSet", "pay"): Case(
+        12, "post", task_detail(Task.TaskStatus.OPEN, "client_user", "pay")
+    ),
+    ("TaskViewSet", "export"): Case(1, "get", task_export),
+    ("TaskViewSet", "stats"): Case(1, "get", lambda f: (None, task_url("stats"))),
+    ("ProposalViewSet", "list"): Case(3, "get", proposal_list),
+    ("ProposalViewSet", "export"): Case(2, "get", lambda f: proposal_list(f, "export")),
+    ("ProposalViewSet", "retrieve"): Case(2, "get", proposal_detail("freelancer_user")),
+    ("ProposalViewSet", "create"): Case(
+        3, "post", proposal_create, data={"message": "Hello"}, status=201
+    ),
+    ("ProposalViewSet", "update"): Case(
+        2, "put", proposal_detail("freelancer_user"), data={"message": "Updated"}
+    ),
+    ("ProposalViewSet", "partial_update"): Case(
+        2, "patch", proposal_detail("freelancer_user"), data={"message": "Patched"}
+    ),
+    ("ProposalViewSet", "destroy"): Case(
+        2, "delete", proposal_detail("freelancer_user"), status=204
+    ),
+    ("ProposalViewSet", "accept"): Case(
+        9, "post", proposal_detail("client_user", "accept")
+    ),
+    ("ProposalViewSet", "reject"): Case(
+        7, "post", proposal_detail("client_user", "reject")
+    ),
+    ("ReviewViewSet", "list"): Case(3, "get", review_list),
+    ("ReviewViewSet", "retrieve"): Case(1, "get", review_detail),
+    ("ReviewViewSet", "create"): Case(
+        5, "post", review_create, data={"rating": 5, "comment": "Great"}, status=201
+    ),
+}
+
+
+def viewset_actions(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from viewset_actions(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "cls", None)
+            if view_class and issubclass(view_class, ViewSetMixin):
+                for action in pattern.callback.actions.values():
+                    yield view_class.__name__, action
+
+
+class Fixtures:
+    def __init__(self, request):
+        self.request = request
+
+    def __getattr__(self, name):
+        return self.request.getfixturevalue(name)
+
+
+def checkout_session():
+    return MagicMock(
+        id="cs_1",
+        url="https://checkout.stripe.com/cs_1",
+        expires_at=int((timezone.now() + timedelta(hours=24)).timestamp()),
+    )
+
+
+def test_every_action_has_budget():
+    actions = set(viewset_actions(get_resolver().url_patterns))
+
+    assert actions - BUDGETS.keys() == set()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "case", BUDGETS.values(), ids=[".".join(key) for key in BUDGETS]
+)
+@patch("apps.payments.services.get_stripe_client")
+def test_query_budget(
+    mock_client, case, request, api_client, django_assert_max_num_queries
+):
+    mock_client.return_value.v1.checkout.sessions.create.return_value = (
+        checkout_session()
+    )
+    user, url = case.setup(Fixtures(request))
+    if user is not None:
+        api_client.force_authenticate(user)
+
+    with django_assert_max_num_queries(case.budget):
+        response = getattr(api_client, case.method)(url, case.data, format="json")
+        if response.streaming:
+            b"".join(response.streaming_content)
+
+    assert response.status_code == case.status, response.data
@@ -0,0 +1,89 @@
+import io
+import uuid
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskSerializer
+
+DATA = {
+    "decimal": Decimal("150.50"),
+    "utc": datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=dt_timezone.utc),
+    "aware": datetime(2025, 1, 2, 3, 4, 5, tzinfo=ZoneInfo("Europe/Moscow")),
+    "naive": datetime(2025, 1, 2, 3, 4, 5),
+    "date": date(2025, 1, 2),
+    "duration": timedelta(minutes=90),
+    "lazy": gettext_lazy("This field is required."),
+    "uuid": uuid.UUID(int=1),
+    "text": "ünïcode\u2028line\u2029separators",
+    1: [None, True, 1.5],
+}
+
+
+@pytest.mark.parametrize("data", [DATA, [DATA], {}, "", None])
+def test_fast_json_renderer_matches_drf(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+def test_fast_json_renderer_matches_drf_on_tasks(task_factory, freelancer_user):
+    task_factory(price=Decimal("99.99"), freelancer=freelancer_user)
+    task_factory(title="Без исполнителя")
+    data = TaskSerializer(Task.objects.all(), many=True).data
+
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_fast_json_renderer_indent_falls_back_to_drf():
+    media_type = "application/json; indent=4"
+
+    rendered = FastJSONRenderer().render({"a": 1}, media_type)
+
+    assert rendered == b'{\n    "a": 1\n}'
+
+
+def test_fast_json_renderer_without_orjson():
+    with patch("apps.core.renderers.orjson", None):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+def test_fast_json_parser():
+    body = '{"title": "Задача", "price": 150.5, "tags": [1, null]}'.encode()
+
+    parsed = FastJSONParser().parse(io.BytesIO(body))
+
+    assert parsed == JSONParser().parse(io.BytesIO(body))
+
+
+def test_fast_json_parser_without_orjson():
+    body = b'{"title": "Task", "price": 150.5}'
+
+    with patch("apps.core.parsers.orjson", None):
+        parsed = FastJSONParser().parse(io.BytesIO(body))
+
+    assert parsed == {"title": "Task", "price": 150.5}
+
+
+@pytest.mark.parametrize("body", [b"{", b'{"price": NaN}', b"\xff"])
+def test_fast_json_parser_invalid(body):
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(body))
+
+
+def test_fast_json_parser_other_encoding_falls_back_to_drf():
+    body = '{"title": "Задача"}'.encode("utf-16")
+
+    parsed = FastJSONParser().parse(io.BytesIO(body), None, {"encoding": "utf-16"})
+
+    assert parsed == {"title": "Задача"}
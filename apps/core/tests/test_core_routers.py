@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from apps.core.db import is_pinned_to_primary, pin_to_primary, replica_reads
+from apps.core.routers import ReplicaRouter
+from apps.core.views import replica_reads as views_replica_reads
+from apps.tasks.models import Task
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+
+
+def test_router_reads_from_primary_by_default(replicas):
+    assert ReplicaRouter().db_for_read(Task) == "default"
+
+
+def test_router_reads_from_replica(replicas):
+    with replica_reads():
+        assert ReplicaRouter().db_for_read(Task) == "replica_1"
+
+
+def test_router_without_replicas():
+    with replica_reads():
+        assert ReplicaRouter().db_for_read(Task) == "default"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_router_reads_from_primary_in_transaction(replicas):
+    with replica_reads(), transaction.atomic():
+        assert ReplicaRouter().db_for_read(Task) == "default"
+
+
+def test_router_writes_and_migrates_on_primary(replicas):
+    router = ReplicaRouter()
+
+    with replica_reads():
+        assert router.db_for_write(Task) == "default"
+    assert router.allow_migrate("replica_1", "tasks") is False
+    assert router.allow_migrate("default", "tasks") is None
+
+
+def test_pin_to_primary(replicas):
+    pin_to_primary(1)
+
+    assert is_pinned_to_primary(1)
+    assert not is_pinned_to_primary(2)
+
+
+@pytest.mark.django_db
+@patch("apps.core.views.replica_reads", wraps=views_replica_reads)
+def test_safe_request_reads_from_replica(mock_replica_reads, replicas, api_client):
+    response = api_client.get(reverse("tasks:task-list"))
+
+    assert response.status_code == 200
+    mock_replica_reads.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch("apps.core.views.replica_reads", wraps=views_replica_reads)
+def test_read_after_write_stays_on_primary(
+    mock_replica_reads, replicas, api_client, client_user, task_data
+):
+    api_client.force_authenticate(client_user)
+
+    response = api_client.post(reverse("tasks:task-list"), task_data)
+    assert response.status_code == 201
+    response = api_client.get(reverse("tasks:task-list"))
+
+    assert response.status_code == 200
+    assert is_pinned_to_primary(client_user.pk)
+    mock_replica_reads.assert_not_called()
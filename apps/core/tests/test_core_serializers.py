@@ -0,0 +1,55 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from django.db.models.functions import Left
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.serializers import ValuesRepresentation
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskListSerializer, TaskSerializer
+
+
+@pytest.fixture
+def tasks(task_factory, freelancer_user):
+    return [
+        task_factory(price=Decimal("99.9"), freelancer=freelancer_user),
+        task_factory(title="Без исполнителя", description=""),
+    ]
+
+
+def render(serializer_class, queryset, request=None):
+    serializer = serializer_class(context={"request": request})
+    representation = ValuesRepresentation.compile(serializer, queryset)
+    rows = queryset.values_list(*representation.columns)
+    return JSONRenderer().render(representation.to_representation(rows))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("time_zone", ["UTC", "Asia/Kolkata"])
+def test_values_representation_matches_serializer(tasks, time_zone):
+    queryset = Task.objects.order_by("pk")
+
+    with timezone.override(time_zone):
+        expected = JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+
+        assert render(TaskSerializer, queryset) == expected
+
+
+@pytest.mark.django_db
+def test_values_representation_of_annotations(tasks):
+    queryset = Task.objects.order_by("pk").annotate(
+        description_snippet=Left("description", 5)
+    )
+    expected = JSONRenderer().render(TaskListSerializer(queryset, many=True).data)
+
+    assert render(TaskListSerializer, queryset) == expected
+
+
+@pytest.mark.django_db
+def test_values_representation_of_unsupported_fields():
+    request = Mock(method="GET", query_params={"expand": "client"})
+    serializer = TaskSerializer(context={"request": request})
+
+    assert ValuesRepresentation.compile(serializer, Task.objects.all()) is None
@@ -0,0 +1,43 @@
+from smtplib import SMTPRecipientsRefused
+from unittest.mock import patch
+
+from apps.core.mail import email_connection
+from apps.core.tasks import send_email_notification, send_mass_email_notification
+
+
+def test_send_email_notification(mailoutbox):
+    send_email_notification("Subject", "Message", ["a@a.com", "b@b.com"])
+
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == ["a@a.com", "b@b.com"]
+
+
+def test_send_mass_email_notification_sends_one_email_per_recipient(mailoutbox):
+    send_mass_email_notification("Subject", "Message", ["a@a.com", "b@b.com"])
+
+    assert [email.to for email in mailoutbox] == [["a@a.com"], ["b@b.com"]]
+    assert all(email.subject == "Subject" for email in mailoutbox)
+
+
+def test_send_mass_email_notification_retries_unsent_recipients_only(mailoutbox):
+    recipients = [f"{name}@a.com" for name in "abcde"]
+    send_messages = email_connection.send_messages
+    calls = 0
+
+    def fail_third(email_messages):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise SMTPRecipientsRefused({"c@a.com": (450, b"Try again later")})
+        return send_messages(email_messages)
+
+    with patch.object(email_connection, "send_messages", side_effect=fail_third):
+        send_mass_email_notification.apply(
+            kwargs={
+                "subject": "Subject",
+                "message": "Message",
+                "recipient_list": recipients,
+            }
+        )
+
+    assert [email.to for email in mailoutbox] == [[r] for r in recipients]
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.core.views import DatabasePoolStatsView
+
+app_name = "core"
+
+urlpatterns = [
+    path("db-pool/", DatabasePoolStatsView.as_view(), name="db-pool-stats"),
+]
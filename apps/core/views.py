@@ -0,0 +1,162 @@
+import hashlib
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .db import is_pinned_to_primary, pool_stats, replica_reads
+from .pagination import KeysetPagination
+from .serializers import ValuesRepresentation
+
+
+class ReplicaReadMixin:
+    """
+    Serves safe requests from the read replicas, unless the user is pinned to
+    the primary after a recent write (see `ReplicaPinningMiddleware`).
+    Authentication and view level permission checks still read from the
+    primary.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with ExitStack() as self.db_context:
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not (
+                request.user.is_authenticated and is_pinned_to_primary(request.user.pk)
+            )
+        ):
+            self.db_context.enter_context(replica_reads())
+
+
+class ExpandRelatedMixin:
+    """
+    Selects the relations a request expands (see `ExpandableFieldsMixin`)
+    along with the objects, so expanding them costs no extra queries.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        request = getattr(self, "request", None)
+        if request is not None and hasattr(serializer_class, "requested_expansions"):
+            expand = serializer_class.requested_expansions(request)
+            if expand:
+                queryset = queryset.select_related(*expand)
+        return queryset
+
+
+class ValuesListMixin:
+    """
+    Serves `list` from `values_list()` rows through `ValuesRepresentation`
+    instead of serializing model instances, when it can represent the
+    serializer. Keyset paginated lists, whose cursors are read from model
+    instances, are served the regular way.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        representation = None
+        if not isinstance(self.paginator, KeysetPagination):
+            representation = ValuesRepresentation.compile(
+                self.get_serializer(), queryset
+            )
+        if representation is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = queryset.values_list(*representation.columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(representation.to_representation(page))
+        return Response(representation.to_representation(queryset))
+
+
+class ConditionalRetrieveMixin:
+    """
+    Adds ETag / Last-Modified validators to `retrieve`, derived from the
+    latest `updated_at` of the object and of the relations the request
+    expands (see `ExpandableFieldsMixin`).
+
+    The validators are computed from a single `values()` query, so a
+    `304 Not Modified` is answered without loading or serializing the object.
+    `get_conditional_queryset` must only contain objects the user may retrieve:
+    views with object level permissions on retrieve have to narrow it down
+    accordingly. Requests it doesn't match fall through to a regular retrieve.
+    """
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_updated_at_fields(self) -> list[str]:
+        # expanded relations are part of the representation, a change to
+        # them has to change the validators too
+        serializer_class = self.get_serializer_class()
+        expand = []
+        if hasattr(serializer_class, "requested_expansions"):
+            expand = serializer_class.requested_expansions(self.request)
+        return ["updated_at", *(f"{name}__updated_at" for name in expand)]
+
+    def get_etag(self, updated_at) -> str:
+        # the representation also depends on the path, query parameters and
+        # the negotiated media type, not only on the row
+        digest = hashlib.md5(
+            "\n".join(
+                (
+                    self.request.get_full_path(),
+                    self.request.accepted_media_type,
+                    updated_at.isoformat(),
+                )
+            ).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        return quote_etag(digest)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = (
+            self.get_conditional_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values(*self.get_updated_at_fields())
+            .first()
+        )
+        if row is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # unset optional relations are None
+        updated_at = max(value for value in row.values() if value is not None)
+        etag = self.get_etag(updated_at)
+        last_modified = int(updated_at.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+@extend_schema(tags=["Core"])
+class DatabasePoolStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Database connection pool statistics",
+        description="Statistics of the connection pools of the worker process "
+        "answering the request, by database alias, including how long requests "
+        "waited for a connection.",
+        responses=OpenApiTypes.OBJECT,
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(pool_stats())
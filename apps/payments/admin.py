@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Payment
+from .models import Payment, StripeEvent
 
 
 @admin.register(Payment)
@@ -10,3 +10,12 @@ class PaymentAdmin(admin.ModelAdmin):
     search_fields = ("task__title", "client__email")
     ordering = ("-created_at",)
     readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = ("event_id", "type", "attempts", "received_at", "processed_at")
+    list_filter = ("type",)
+    search_fields = ("event_id",)
+    ordering = ("-received_at",)
+    readonly_fields = ("event_id", "type", "payload", "received_at", "processed_at")
@@ -0,0 +1,42 @@
+import functools
+import os
+
+import requests
+import stripe
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+@functools.cache
+def get_stripe_client() -> stripe.StripeClient:
+    """
+    Returns the Stripe client shared by everything in the current process,
+    built on first use.
+
+    Its HTTP session keeps up to `STRIPE_POOL_SIZE` connections to the API
+    alive between requests, requests time out after `STRIPE_CONNECT_TIMEOUT`
+    / `STRIPE_READ_TIMEOUT` seconds, and failed requests are retried with
+    backoff at most `STRIPE_MAX_NETWORK_RETRIES` times. `STRIPE_API_BASE`
+    points the client at another API host, e.g. a local stand-in.
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=settings.STRIPE_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return stripe.StripeClient(
+        settings.STRIPE_SECRET_KEY,
+        http_client=stripe.RequestsClient(
+            timeout=(settings.STRIPE_CONNECT_TIMEOUT, settings.STRIPE_READ_TIMEOUT),
+            session=session,
+        ),
+        max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES,
+        base_addresses=(
+            {"api": settings.STRIPE_API_BASE} if settings.STRIPE_API_BASE else {}
+        ),
+    )
+
+
+# forked workers must not share their parent's connections
+os.register_at_fork(after_in_child=get_stripe_client.cache_clear)
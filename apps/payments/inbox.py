@@ -0,0 +1,56 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import StripeEvent
+from .services import StripeService
+
+logger = logging.getLogger(__name__)
+
+PROCESS_BATCH_SIZE = 100
+MAX_ATTEMPTS = 10
+
+
+def process_pending(batch_size: int = PROCESS_BATCH_SIZE) -> int:
+    """
+    Processes up to `batch_size` pending Stripe events from the inbox.
+    Rows locked by a concurrent worker are skipped, so workers can run in
+    parallel. An event is marked processed in the transaction that applies it,
+    so it is applied exactly once; failed events are retried on later runs,
+    at most `MAX_ATTEMPTS` times.
+    """
+
+    service = StripeService()
+    with transaction.atomic():
+        events = list(
+            StripeEvent.objects.filter(
+                processed_at__isnull=True, attempts__lt=MAX_ATTEMPTS
+            ).select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not events:
+            return 0
+
+        for event in events:
+            event.attempts += 1
+            try:
+                with transaction.atomic():
+                    service.process_webhook_event(
+                        service.client.deserialize(event.payload, api_mode="V1")
+                    )
+            except Exception as e:
+                logger.error(
+                    f"Failed to process Stripe event {event.event_id} "
+                    f"(attempt {event.attempts}): {e}",
+                    exc_info=True,
+                )
+                event.last_error = str(e)
+            else:
+                event.processed_at = timezone.now()
+
+        StripeEvent.objects.bulk_update(
+            events, ["attempts", "last_error", "processed_at"]
+        )
+
+    logger.info(f"Processed {len(events)} Stripe events.")
+    return len(events)
@@ -0,0 +1,95 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from django.db.models import Min, Q
+
+from apps.payments.client import get_stripe_client
+from apps.payments.models import Payment
+
+# a payment is created right after its checkout session
+MATCH_WINDOW = timedelta(minutes=5)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills in Stripe checkout session and payment intent ids of payments "
+        "created before they were stored, from Stripe's checkout sessions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the matches without saving them.",
+        )
+
+    def handle(self, *args, dry_run, **options):
+        missing = Payment.objects.filter(
+            Q(stripe_checkout_session_id__isnull=True)
+            | Q(
+                status=Payment.PaymentStatus.SUCCEEDED,
+                stripe_payment_intent_id__isnull=True,
+            )
+        )
+        oldest = missing.aggregate(oldest=Min("created_at"))["oldest"]
+        if oldest is None:
+            self.stdout.write("No payments to backfill.")
+            return
+
+        payments_by_task = defaultdict(list)
+        for payment in missing.order_by("created_at"):
+            payments_by_task[payment.task_id].append(payment)
+
+        sessions = get_stripe_client().v1.checkout.sessions.list(
+            params={
+                "created": {"gte": int((oldest - MATCH_WINDOW).timestamp())},
+                "limit": 100,
+            }
+        )
+        matched = []
+        for session in sessions.auto_paging_iter():
+            if not (session.client_reference_id or "").isdigit():
+                continue
+            payment = self._match(
+                payments_by_task.get(int(session.client_reference_id), []), session
+            )
+            if payment is not None:
+                payment.stripe_checkout_session_id = session.id
+                payment.stripe_payment_intent_id = session.payment_intent
+                matched.append(payment)
+
+        if not dry_run:
+            Payment.objects.bulk_update(
+                matched,
+                ["stripe_checkout_session_id", "stripe_payment_intent_id"],
+                batch_size=500,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Matched' if dry_run else 'Backfilled'} {len(matched)} payments."
+            )
+        )
+
+    @staticmethod
+    def _match(payments: list[Payment], session) -> Payment | None:
+        """
+        Pops the payment created for `session`: the payment of the task with
+        that session id, or else the latest one of the same amount without a
+        session id, created within `MATCH_WINDOW` after the session. Stripe
+        lists the newest sessions first, so payments of newer sessions of the
+        task are already taken.
+        """
+
+        created = datetime.fromtimestamp(session.created, tz=dt_timezone.utc)
+        for payment in reversed(payments):
+            if payment.stripe_checkout_session_id == session.id or (
+                payment.stripe_checkout_session_id is None
+                and int(payment.amount * 100) == session.amount_total
+                and created <= payment.created_at <= created + MATCH_WINDOW
+            ):
+                payments.remove(payment)
+                return payment
+        return None
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.payments.inbox import PROCESS_BATCH_SIZE, process_pending
+
+
+class Command(BaseCommand):
+    help = "Processes Stripe webhook events stored in the inbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PROCESS_BATCH_SIZE,
+            help="Maximum number of events processed per transaction.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the inbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the inbox once and exit instead of polling.",
+        )
+
+    def handle(self, *args, batch_size, interval, once, **options):
+        while True:
+            processed = process_pending(batch_size)
+            if processed == batch_size:
+                continue
+            if once:
+                return
+            time.sleep(interval)
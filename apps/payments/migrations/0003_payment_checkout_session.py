@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0002_stripe_event"),
+        ("tasks", "0008_task_status_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payment",
+            name="checkout_expires_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Date and time when the Stripe checkout session expires.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="payment",
+            name="checkout_url",
+            field=models.URLField(
+                blank=True,
+                help_text="Url of the Stripe checkout session.",
+                max_length=2048,
+            ),
+        ),
+        migrations.AddField(
+            model_name="payment",
+            name="idempotency_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Idempotency-Key the checkout session was requested with.",
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="payment",
+            name="stripe_checkout_session_id",
+            field=models.CharField(
+                blank=True,
+                help_text="Id of the Stripe checkout session paying this payment.",
+                max_length=255,
+                null=True,
+                unique=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["task", "checkout_expires_at"],
+                name="payment_open_checkout_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="payment",
+            constraint=models.UniqueConstraint(
+                fields=("client", "idempotency_key"),
+                name="unique_payment_idempotency_key",
+            ),
+        ),
+    ]
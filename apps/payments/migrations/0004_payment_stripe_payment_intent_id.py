@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0003_payment_checkout_session"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payment",
+            name="stripe_payment_intent_id",
+            field=models.CharField(
+                blank=True,
+                help_text="Id of the Stripe payment intent created by the checkout session.",
+                max_length=255,
+                null=True,
+                unique=True,
+            ),
+        ),
+    ]
@@ -35,9 +35,94 @@ class Payment(TimeStampModel):
         default=PaymentStatus.PENDING,
         help_text="The status of the payment.",
     )
+    stripe_checkout_session_id = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Id of the Stripe checkout session paying this payment.",
+    )
+    stripe_payment_intent_id = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Id of the Stripe payment intent created by the checkout session.",
+    )
+    checkout_url = models.URLField(
+        max_length=2048,
+        blank=True,
+        help_text="Url of the Stripe checkout session.",
+    )
+    checkout_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Date and time when the Stripe checkout session expires.",
+    )
+    idempotency_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Idempotency-Key the checkout session was requested with.",
+    )
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["client", "idempotency_key"],
+                name="unique_payment_idempotency_key",
+            )
+        ]
+        indexes = [
+            # open checkout sessions of a task, see StripeService
+            models.Index(
+                fields=["task", "checkout_expires_at"],
+                condition=models.Q(status="pending"),
+                name="payment_open_checkout_idx",
+            )
+        ]
 
     def __str__(self) -> str:
         return f"Payment for Task #{self.task.pk} - {self.amount} ({self.status})"
+
+
+class StripeEvent(models.Model):
+    """
+    A verified Stripe webhook event, stored before the delivery is acknowledged
+    and processed later by `apps.payments.inbox`. The unique event id turns
+    Stripe's redeliveries into no-ops.
+    """
+
+    event_id = models.CharField(
+        max_length=255, unique=True, help_text="Id of the Stripe event."
+    )
+    type = models.CharField(max_length=255, help_text="Type of the Stripe event.")
+    payload = models.JSONField(help_text="The event as sent by Stripe.")
+    attempts = models.PositiveSmallIntegerField(
+        default=0, help_text="Number of times processing was attempted."
+    )
+    last_error = models.TextField(
+        blank=True, help_text="Error of the last failed processing attempt."
+    )
+    received_at = models.DateTimeField(
+        auto_now_add=True, help_text="Date and time when the event was received."
+    )
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Date and time when the event was processed.",
+    )
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="stripe_event_pending_idx",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"StripeEvent {self.event_id} {self.type}"
@@ -1,81 +1,187 @@
+import json
 import logging
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 
 import stripe
 from django.conf import settings
 from django.db import transaction
 from django.urls import reverse
+from django.utils import timezone
+from django_fsm import can_proceed
+from rest_framework.exceptions import ValidationError
 
+from apps.core import outbox
 from apps.core.tasks import send_email_notification
-from apps.payments.models import Payment
+from apps.payments.client import get_stripe_client
+from apps.payments.models import Payment, StripeEvent
 from apps.tasks.models import Task
+from apps.tasks.transitions import apply_transition
 
 logger = logging.getLogger(__name__)
 
+# open checkout sessions expiring sooner than this are not handed out again
+CHECKOUT_REUSE_MARGIN = timedelta(minutes=5)
+
 
 class StripeService:
     def __init__(self):
-        stripe.api_key = settings.STRIPE_SECRET_KEY
+        self.client = get_stripe_client()
 
-    def create_checkout_session(self, task: Task) -> str | None:
+    def create_checkout_session(
+        self, task: Task, idempotency_key: str | None = None
+    ) -> str | None:
         """
-        Creates stripe checkout session,
-        creates payment object if session created successfully.
-        Sends Email to client of payed task.
+        Returns the url of a Stripe checkout session paying `task`.
+
+        An open session for the task's current price is reused, as is the
+        session created for a repeated `idempotency_key`. Otherwise a pending
+        payment is claimed in a short transaction and its session is created
+        at Stripe outside of it, so a slow Stripe call holds neither the task
+        row nor a database connection. The Stripe idempotency key is derived
+        from the payment, retries and concurrent requests claiming the same
+        payment get the same session. The client of the task is sent an email
+        once the session is stored.
         """
 
+        max_key_length = Payment._meta.get_field("idempotency_key").max_length
+        if idempotency_key is not None and len(idempotency_key) > max_key_length:
+            raise ValidationError(
+                f"Idempotency-Key must not exceed {max_key_length} characters."
+            )
+
+        with transaction.atomic():
+            # serializes concurrent requests for the task, the second one
+            # finds the payment claimed by the first
+            Task.objects.select_for_update().values("pk").get(pk=task.pk)
+
+            payment = self._get_reusable_payment(task, idempotency_key)
+            if payment is None:
+                payment = Payment.objects.create(
+                    task=task,
+                    client=task.client,
+                    amount=task.price,
+                    status=Payment.PaymentStatus.PENDING,
+                    idempotency_key=idempotency_key,
+                )
+                logger.info(
+                    f"Created pending payment (ID: {payment.pk}) for task ID: "
+                    f"{task.pk}"
+                )
+
+        if payment.checkout_url:
+            logger.info(
+                f"Reusing checkout session of payment (ID: {payment.pk}) for "
+                f"task ID: {task.pk}"
+            )
+            return payment.checkout_url
+        if payment.status != Payment.PaymentStatus.PENDING:
+            # a failed attempt with the same idempotency key
+            return None
+        return self._create_stripe_session(task, payment)
+
+    def _get_reusable_payment(
+        self, task: Task, idempotency_key: str | None
+    ) -> Payment | None:
+        if idempotency_key is not None:
+            payment = Payment.objects.filter(
+                client=task.client_id, idempotency_key=idempotency_key
+            ).first()
+            if payment is not None:
+                if payment.task_id != task.pk:
+                    raise ValidationError(
+                        "This Idempotency-Key was already used for another task."
+                    )
+                return payment
+
+        pending = Payment.objects.filter(
+            task=task, status=Payment.PaymentStatus.PENDING, amount=task.price
+        )
+        open_session = (
+            pending.filter(
+                checkout_expires_at__gt=timezone.now() + CHECKOUT_REUSE_MARGIN
+            )
+            .exclude(checkout_url="")
+            .order_by("-checkout_expires_at")
+            .first()
+        )
+        if open_session is not None or idempotency_key is not None:
+            return open_session
+        # claimed by a request still waiting for Stripe, or whose Stripe call
+        # failed transiently
+        return pending.filter(checkout_url="", idempotency_key=None).first()
+
+    def _create_stripe_session(self, task: Task, payment: Payment) -> str | None:
         try:
-            checkout_session = stripe.checkout.Session.create(
-                line_items=[
-                    {
-                        "price_data": {
-                            "currency": "usd",
-                            "product_data": {
-                                "name": task.title,
+            checkout_session = self.client.v1.checkout.sessions.create(
+                params={
+                    "line_items": [
+                        {
+                            "price_data": {
+                                "currency": "usd",
+                                "product_data": {
+                                    "name": task.title,
+                                },
+                                # Amount in cents
+                                "unit_amount": int(payment.amount * 100),
                             },
-                            "unit_amount": int(task.price * 100),  # Amount in cents
-                        },
-                        "quantity": 1,
-                    }
-                ],
-                mode="payment",
-                success_url=reverse("payments:payment-success"),
-                cancel_url=reverse("payments:payment-cancel"),
-                client_reference_id=str(task.pk),
+                            "quantity": 1,
+                        }
+                    ],
+                    "mode": "payment",
+                    "success_url": reverse("payments:payment-success"),
+                    "cancel_url": reverse("payments:payment-cancel"),
+                    "client_reference_id": str(task.pk),
+                },
+                options={"idempotency_key": f"checkout-payment-{payment.pk}"},
             )
         except stripe.StripeError as e:
             logger.error(f"Failed to create stripe session: {e}")
-            return
+            if not _is_transient(e):
+                self._fail_payment(payment)
+            return None
 
         if not checkout_session.url:
             logger.warning(
                 f"Url for checkout session for task {task.pk} wasn't created"
             )
-            return
+            self._fail_payment(payment)
+            return None
 
-        payment = Payment.objects.create(
-            task=task,
-            client=task.client,
-            amount=task.price,
-            status=Payment.PaymentStatus.PENDING,
-        )
-        logger.info(
-            f"Created pending payment (ID: {payment.pk}) for task ID: {task.pk}"
-        )
+        with transaction.atomic():
+            # a concurrent request may have stored the same session already
+            stored = Payment.objects.filter(pk=payment.pk, checkout_url="").update(
+                stripe_checkout_session_id=checkout_session.id,
+                checkout_url=checkout_session.url,
+                checkout_expires_at=datetime.fromtimestamp(
+                    checkout_session.expires_at, tz=dt_timezone.utc
+                ),
+                updated_at=timezone.now(),
+            )
+            if stored:
+                outbox.publish(
+                    send_email_notification,
+                    subject="Checkout session created",
+                    message=f"To pay task - go to link {checkout_session.url}",
+                    recipient_list=[task.client.email],
+                )
+                logger.info(f"Created stripe checkout session for task ID: {task.pk}")
 
-        logger.info(f"Created stripe checkout session for task ID: {task.pk}")
+        return checkout_session.url
 
-        send_email_notification.delay(
-            subject="Checkout session created",
-            message=f"To pay task - go to link {checkout_session.url}",
-            recipient_list=[task.client.email],
+    def _fail_payment(self, payment: Payment) -> None:
+        Payment.objects.filter(pk=payment.pk, checkout_url="").update(
+            status=Payment.PaymentStatus.FAILED, updated_at=timezone.now()
         )
 
-        return checkout_session.url
-
-    @transaction.atomic
     def handle_webhook_event(self, payload, sig_header) -> None:
+        """
+        Verifies a webhook delivery and stores the event in the inbox, where
+        `apps.payments.inbox` picks it up. Redelivered events are stored once.
+        """
+
         try:
-            event = stripe.Webhook.construct_event(
+            event = self.client.construct_event(
                 payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
             )
             logger.info(
@@ -88,25 +194,94 @@ class StripeService:
             logger.error(f"Invalid signature for Stripe webhook: {e}")
             raise e
 
-        if event.type == "checkout.session.completed":
-            session = event.data.object
-            client_reference_id = session.client_reference_id
-            try:
-                payment = Payment.objects.get(id=client_reference_id)
-                payment.status = Payment.PaymentStatus.SUCCEEDED
-                payment.save()
-                payment.task.pay()
-                payment.task.save()
-                logger.info(
-                    f"Payment (ID: {payment.pk}) for task (ID: {payment.task.pk}) "
-                    "succeeded."
-                )
-                send_email_notification.delay(
-                    subject="Task paid successfully",
-                    message=f"Your task {payment.task.title} was paid successfully",
-                    recipient_list=[payment.task.client.email],
-                )
-            except Payment.DoesNotExist:
-                logger.error(
-                    f"Payment with client_reference_id {client_reference_id} not found."
+        # a single INSERT ... ON CONFLICT DO NOTHING, redeliveries are dropped
+        StripeEvent.objects.bulk_create(
+            [
+                StripeEvent(
+                    event_id=event.id, type=event.type, payload=json.loads(payload)
                 )
+            ],
+            ignore_conflicts=True,
+        )
+
+    @transaction.atomic
+    def process_webhook_event(self, event: stripe.Event) -> None:
+        """Applies a stored Stripe event."""
+
+        if event.type == "checkout.session.completed":
+            self._complete_checkout_session(event.data.object)
+        elif event.type == "charge.refunded":
+            self._refund_charge(event.data.object)
+
+    def _complete_checkout_session(self, session) -> None:
+        payment = (
+            Payment.objects.select_related("task__client")
+            .select_for_update(of=("self",))
+            .filter(stripe_checkout_session_id=session.id)
+            .first()
+        )
+        if payment is None:
+            logger.error(f"Payment for checkout session {session.id} not found.")
+            return
+        if payment.status == Payment.PaymentStatus.SUCCEEDED:
+            logger.info(f"Payment (ID: {payment.pk}) has already succeeded.")
+            return
+
+        payment.status = Payment.PaymentStatus.SUCCEEDED
+        payment.stripe_payment_intent_id = session.payment_intent
+        payment.save(update_fields=["status", "stripe_payment_intent_id", "updated_at"])
+
+        task = payment.task
+        if not can_proceed(task.pay) or not apply_transition(task, task.pay):
+            logger.error(
+                f"Payment (ID: {payment.pk}) succeeded, but task (ID: {task.pk}) "
+                f"can't be paid from status '{task.status}'."
+            )
+            # the money was taken, it's refunded by hand rather than lost
+            outbox.publish(
+                send_email_notification,
+                subject="Payment received for a task that can't be paid",
+                message=(
+                    f"Your payment for task {task.title} was received, but the "
+                    f"task can't be paid anymore. The payment will be reviewed "
+                    f"and refunded."
+                ),
+                recipient_list=[task.client.email],
+            )
+            return
+
+        logger.info(f"Payment (ID: {payment.pk}) for task (ID: {task.pk}) succeeded.")
+        outbox.publish(
+            send_email_notification,
+            subject="Task paid successfully",
+            message=f"Your task {task.title} was paid successfully",
+            recipient_list=[task.client.email],
+        )
+
+    def _refund_charge(self, charge) -> None:
+        if not charge.refunded:
+            # partially refunded, the payment still holds the rest
+            logger.info(
+                f"Charge {charge.id} for payment intent {charge.payment_intent} "
+                f"partially refunded: {charge.amount_refunded} of {charge.amount}."
+            )
+            return
+
+        refunded = Payment.objects.filter(
+            stripe_payment_intent_id=charge.payment_intent
+        ).update(status=Payment.PaymentStatus.REFUNDED, updated_at=timezone.now())
+        if not refunded:
+            logger.error(
+                f"Payment for payment intent {charge.payment_intent} not found."
+            )
+            return
+        logger.info(f"Payment for payment intent {charge.payment_intent} refunded.")
+
+
+def _is_transient(error: stripe.StripeError) -> bool:
+    """Tells whether retrying the same request may succeed."""
+
+    if isinstance(error, stripe.IdempotencyError):
+        # 409: a concurrent request with the same key is still in progress
+        return error.http_status == 409
+    return isinstance(error, (stripe.APIConnectionError, stripe.RateLimitError))
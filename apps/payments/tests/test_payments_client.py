@@ -0,0 +1,32 @@
+import pytest
+
+from apps.payments.client import get_stripe_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_client():
+    get_stripe_client.cache_clear()
+    yield
+    get_stripe_client.cache_clear()
+
+
+def test_get_stripe_client_is_shared():
+    assert get_stripe_client() is get_stripe_client()
+
+
+def test_get_stripe_client_settings(settings):
+    settings.STRIPE_API_BASE = "http://localhost:12111"
+    settings.STRIPE_CONNECT_TIMEOUT = 1.5
+    settings.STRIPE_READ_TIMEOUT = 7
+    settings.STRIPE_MAX_NETWORK_RETRIES = 3
+    settings.STRIPE_POOL_SIZE = 4
+
+    client = get_stripe_client()
+
+    options = client._requestor._options
+    assert options.base_addresses["api"] == "http://localhost:12111"
+    assert options.max_network_retries == 3
+    http_client = client._requestor._client
+    assert http_client._timeout == (1.5, 7)
+    adapter = http_client._session.get_adapter("https://api.stripe.com")
+    assert adapter._pool_maxsize == 4
@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+
+from apps.payments.models import Payment
+
+
+def session(session_id, payment, payment_intent=None, seconds_before=1):
+    return MagicMock(
+        id=session_id,
+        client_reference_id=str(payment.task_id),
+        payment_intent=payment_intent,
+        amount_total=int(payment.amount * 100),
+        created=int(payment.created_at.timestamp()) - seconds_before,
+    )
+
+
+@pytest.mark.django_db
+@patch("apps.payments.management.commands.backfill_stripe_ids.get_stripe_client")
+def test_backfill_stripe_ids(mock_client, payment_factory):
+    unmatched = payment_factory()
+    first = payment_factory()
+    second = payment_factory(status=Payment.PaymentStatus.SUCCEEDED)
+    mock_list = mock_client.return_value.v1.checkout.sessions.list
+    mock_list.return_value.auto_paging_iter.return_value = [
+        session("cs_2", second, payment_intent="pi_2"),
+        session("cs_1", first),
+        session("cs_old", unmatched, seconds_before=3600),
+    ]
+
+    call_command("backfill_stripe_ids")
+
+    first.refresh_from_db()
+    assert first.stripe_checkout_session_id == "cs_1"
+    assert first.stripe_payment_intent_id is None
+    second.refresh_from_db()
+    assert second.stripe_checkout_session_id == "cs_2"
+    assert second.stripe_payment_intent_id == "pi_2"
+    unmatched.refresh_from_db()
+    assert unmatched.stripe_checkout_session_id is None
+
+
+@pytest.mark.django_db
+@patch("apps.payments.management.commands.backfill_stripe_ids.get_stripe_client")
+def test_backfill_stripe_ids_dry_run(mock_client, payment_factory):
+    payment = payment_factory()
+    mock_list = mock_client.return_value.v1.checkout.sessions.list
+    mock_list.return_value.auto_paging_iter.return_value = [session("cs_1", payment)]
+
+    call_command("backfill_stripe_ids", dry_run=True)
+
+    payment.refresh_from_db()
+    assert payment.stripe_checkout_session_id is None
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+
+from apps.payments import inbox
+from apps.payments.models import Payment, StripeEvent
+from apps.tasks.models import Task
+
+
+def checkout_completed(event_id, session_id):
+    return StripeEvent.objects.create(
+        event_id=event_id,
+        type="checkout.session.completed",
+        payload={
+            "id": event_id,
+            "object": "event",
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "id": session_id,
+                    "object": "checkout.session",
+                    "payment_intent": f"pi_{session_id}",
+                }
+            },
+        },
+    )
+
+
+@pytest.mark.django_db
+def test_process_pending_applies_events(payment_factory):
+    payment = payment_factory(stripe_checkout_session_id="cs_1")
+    event = checkout_completed("evt_1", "cs_1")
+
+    assert inbox.process_pending() == 1
+    assert inbox.process_pending() == 0
+
+    event.refresh_from_db()
+    assert event.processed_at is not None
+    assert event.attempts == 1
+    payment.refresh_from_db()
+    assert payment.status == Payment.PaymentStatus.SUCCEEDED
+    assert payment.task.status == Task.TaskStatus.PAID
+
+
+@pytest.mark.django_db
+@patch("apps.payments.inbox.StripeService.process_webhook_event")
+def test_process_pending_records_failures(mock_process, payment_factory):
+    mock_process.side_effect = [RuntimeError("boom"), None]
+    failing = checkout_completed("evt_1", "cs_1")
+    succeeding = checkout_completed("evt_2", "cs_2")
+
+    assert inbox.process_pending() == 2
+
+    failing.refresh_from_db()
+    assert failing.processed_at is None
+    assert failing.attempts == 1
+    assert failing.last_error == "boom"
+    succeeding.refresh_from_db()
+    assert succeeding.processed_at is not None
+
+
+@pytest.mark.django_db
+@patch("apps.payments.inbox.StripeService.process_webhook_event")
+def test_process_pending_gives_up_after_max_attempts(mock_process):
+    event = checkout_completed("evt_1", "cs_1")
+    StripeEvent.objects.filter(pk=event.pk).update(attempts=inbox.MAX_ATTEMPTS)
+
+    assert inbox.process_pending() == 0
+    mock_process.assert_not_called()
@@ -1,34 +1,128 @@
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
 import stripe
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 
-from apps.payments.models import Payment
+from apps.payments.models import Payment, StripeEvent
 from apps.payments.services import StripeService
 from apps.tasks.models import Task
 
 
 @pytest.fixture
 def mock_stripe():
-    with patch("stripe.checkout.Session.create") as mock_create:
-        with patch("stripe.Webhook.construct_event") as mock_construct_event:
-            yield mock_create, mock_construct_event
+    with patch("apps.payments.services.get_stripe_client") as mock_client:
+        client = mock_client.return_value
+        yield client.v1.checkout.sessions.create, client.construct_event
+
+
+def checkout_session(session_id="cs_1", expires_in=timedelta(hours=24)):
+    return MagicMock(
+        id=session_id,
+        url=f"http://mock-stripe-url.com/{session_id}",
+        expires_at=int((timezone.now() + expires_in).timestamp()),
+    )
 
 
 @pytest.mark.django_db
 def test_create_checkout_session_success(mock_stripe, task_factory):
     mock_create, _ = mock_stripe
-    mock_create.return_value.url = "http://mock-stripe-url.com"
+    mock_create.return_value = checkout_session()
     task = task_factory()
     service = StripeService()
 
     checkout_url = service.create_checkout_session(task)
 
-    assert checkout_url == "http://mock-stripe-url.com"
+    assert checkout_url == "http://mock-stripe-url.com/cs_1"
     mock_create.assert_called_once()
     payment = Payment.objects.get(task=task, client=task.client)
     assert payment.amount == task.price
     assert payment.status == Payment.PaymentStatus.PENDING
+    assert payment.stripe_checkout_session_id == "cs_1"
+    assert payment.checkout_url == checkout_url
+
+
+@pytest.mark.django_db
+def test_create_checkout_session_reuses_open_session(mock_stripe, task_factory):
+    mock_create, _ = mock_stripe
+    mock_create.return_value = checkout_session()
+    task = task_factory()
+    service = StripeService()
+
+    first_url = service.create_checkout_session(task)
+    second_url = service.create_checkout_session(task)
+
+    assert second_url == first_url
+    mock_create.assert_called_once()
+    assert Payment.objects.filter(task=task).count() == 1
+
+
+@pytest.mark.django_db
+def test_create_checkout_session_replaces_expiring_session(mock_stripe, task_factory):
+    mock_create, _ = mock_stripe
+    mock_create.side_effect = [
+        checkout_session("cs_1", expires_in=timedelta(minutes=1)),
+        checkout_session("cs_2"),
+    ]
+    task = task_factory()
+    service = StripeService()
+
+    service.create_checkout_session(task)
+    checkout_url = service.create_checkout_session(task)
+
+    assert checkout_url == "http://mock-stripe-url.com/cs_2"
+    assert mock_create.call_count == 2
+
+
+@pytest.mark.django_db
+def test_create_checkout_session_after_price_change(mock_stripe, task_factory):
+    mock_create, _ = mock_stripe
+    mock_create.side_effect = [checkout_session("cs_1"), checkout_session("cs_2")]
+    task = task_factory()
+    service = StripeService()
+
+    service.create_checkout_session(task)
+    task.price = 200
+    task.save()
+    checkout_url = service.create_checkout_session(task)
+
+    assert checkout_url == "http://mock-stripe-url.com/cs_2"
+
+
+@pytest.mark.django_db
+def test_create_checkout_session_idempotency_key(mock_stripe, task_factory):
+    mock_create, _ = mock_stripe
+    mock_create.return_value = checkout_session()
+    task = task_factory()
+    service = StripeService()
+
+    first_url = service.create_checkout_session(task, idempotency_key="key")
+    Payment.objects.update(status=Payment.PaymentStatus.FAILED)
+    second_url = service.create_checkout_session(task, idempotency_key="key")
+
+    assert second_url == first_url
+    mock_create.assert_called_once()
+    payment = Payment.objects.get()
+    assert mock_create.call_args.kwargs["options"] == {
+        "idempotency_key": f"checkout-payment-{payment.pk}"
+    }
+
+
+@pytest.mark.django_db
+def test_create_checkout_session_idempotency_key_of_other_task(
+    mock_stripe, task_factory
+):
+    mock_create, _ = mock_stripe
+    mock_create.return_value = checkout_session()
+    service = StripeService()
+    service.create_checkout_session(task_factory(), idempotency_key="key")
+
+    with pytest.raises(ValidationError):
+        service.create_checkout_session(task_factory(), idempotency_key="key")
 
 
 @pytest.mark.django_db
@@ -42,64 +136,215 @@ def test_create_checkout_session_stripe_error(mock_stripe, task_factory):
 
     assert checkout_url is None
     mock_create.assert_called_once()
-    assert not Payment.objects.filter(task=task).exists()
+    payment = Payment.objects.get(task=task)
+    assert payment.status == Payment.PaymentStatus.FAILED
+    assert payment.checkout_url == ""
 
 
 @pytest.mark.django_db
-def test_handle_webhook_event_checkout_session_completed_success(
-    mock_stripe, payment_factory
+def test_create_checkout_session_after_stripe_error(mock_stripe, task_factory):
+    mock_create, _ = mock_stripe
+    mock_create.side_effect = [stripe.StripeError("Stripe error"), checkout_session()]
+    task = task_factory()
+    service = StripeService()
+
+    service.create_checkout_session(task)
+    checkout_url = service.create_checkout_session(task)
+
+    assert checkout_url == "http://mock-stripe-url.com/cs_1"
+    # a new payment, under a new Stripe idempotency key
+    failed, payment = Payment.objects.order_by("pk")
+    assert payment.checkout_url == checkout_url
+    assert [call.kwargs["options"] for call in mock_create.call_args_list] == [
+        {"idempotency_key": f"checkout-payment-{failed.pk}"},
+        {"idempotency_key": f"checkout-payment-{payment.pk}"},
+    ]
+
+
+@pytest.mark.django_db
+def test_create_checkout_session_retries_transient_stripe_error(
+    mock_stripe, task_factory
+):
+    mock_create, _ = mock_stripe
+    mock_create.side_effect = [
+        stripe.APIConnectionError("Connection error"),
+        checkout_session(),
+    ]
+    task = task_factory()
+    service = StripeService()
+
+    assert service.create_checkout_session(task) is None
+    checkout_url = service.create_checkout_session(task)
+
+    # the pending payment is claimed again, with the same Stripe idempotency key
+    payment = Payment.objects.get()
+    assert payment.checkout_url == checkout_url
+    first, second = mock_create.call_args_list
+    assert first.kwargs["options"] == second.kwargs["options"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_create_checkout_session_calls_stripe_outside_transaction(
+    mock_stripe, task_factory
 ):
+    mock_create, _ = mock_stripe
+    in_transaction = []
+
+    def create(**kwargs):
+        in_transaction.append(connection.in_atomic_block)
+        # the task row isn't locked while Stripe is called
+        Task.objects.filter(pk=task.pk).update(title="Updated")
+        return checkout_session()
+
+    mock_create.side_effect = create
+    task = task_factory()
+
+    checkout_url = StripeService().create_checkout_session(task)
+
+    assert in_transaction == [False]
+    assert Payment.objects.get().checkout_url == checkout_url
+
+
+@pytest.mark.django_db
+def test_handle_webhook_event_stores_event(mock_stripe):
     _, mock_construct_event = mock_stripe
-    payment = payment_factory()
     mock_construct_event.return_value = MagicMock(
+        id="evt_1", type="checkout.session.completed"
+    )
+
+    service = StripeService()
+    service.handle_webhook_event(b'{"id": "evt_1"}', "sig_header")
+    service.handle_webhook_event(b'{"id": "evt_1"}', "sig_header")
+
+    event = StripeEvent.objects.get()
+    assert event.event_id == "evt_1"
+    assert event.type == "checkout.session.completed"
+    assert event.payload == {"id": "evt_1"}
+    assert event.processed_at is None
+
+
+def checkout_session_completed(session_id, payment_intent="pi_1"):
+    return MagicMock(
         type="checkout.session.completed",
-        data=MagicMock(
-            object=MagicMock(
-                client_reference_id=str(payment.id),
-            )
-        ),
+        data=MagicMock(object=MagicMock(id=session_id, payment_intent=payment_intent)),
     )
 
+
+@pytest.mark.django_db
+@patch("apps.payments.services.outbox.publish")
+def test_process_webhook_event_checkout_session_completed_success(
+    mock_publish, payment_factory
+):
+    payment = payment_factory(stripe_checkout_session_id="cs_1")
+
     service = StripeService()
-    service.handle_webhook_event("payload", "sig_header")
+    service.process_webhook_event(checkout_session_completed("cs_1"))
 
     payment.refresh_from_db()
     assert payment.status == Payment.PaymentStatus.SUCCEEDED
+    assert payment.stripe_payment_intent_id == "pi_1"
     assert payment.task.status == Task.TaskStatus.PAID
+    mock_publish.assert_called_once()
 
 
 @pytest.mark.django_db
-def test_handle_webhook_event_checkout_session_completed_payment_not_found(
-    mock_stripe,
+def test_process_webhook_event_checkout_session_completed_is_one_query(
+    payment_factory,
 ):
-    _, mock_construct_event = mock_stripe
-    mock_construct_event.return_value = MagicMock(
-        type="checkout.session.completed",
-        data=MagicMock(
-            object=MagicMock(
-                client_reference_id="99999",  # Non-existent payment ID
-            )
-        ),
-    )
+    payment_factory(stripe_checkout_session_id="cs_1")
+    payment_factory(stripe_checkout_session_id="cs_2")
 
     service = StripeService()
-    service.handle_webhook_event("payload", "sig_header")
+    with CaptureQueriesContext(connection) as captured:
+        service.process_webhook_event(checkout_session_completed("cs_2"))
+
+    lookups = [q["sql"] for q in captured if q["sql"].startswith("SELECT")]
+    assert len(lookups) == 1
+    assert '"stripe_checkout_session_id" = ' in lookups[0]
 
 
 @pytest.mark.django_db
-def test_handle_webhook_event_charge_refunded(mock_stripe):
-    _, mock_construct_event = mock_stripe
-    mock_construct_event.return_value = MagicMock(
+@patch("apps.payments.services.outbox.publish")
+def test_process_webhook_event_checkout_session_completed_twice(
+    mock_publish, payment_factory
+):
+    payment_factory(stripe_checkout_session_id="cs_1")
+
+    service = StripeService()
+    service.process_webhook_event(checkout_session_completed("cs_1"))
+    service.process_webhook_event(checkout_session_completed("cs_1"))
+
+    mock_publish.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch("apps.payments.services.outbox.publish")
+def test_process_webhook_event_checkout_session_completed_task_canceled(
+    mock_publish, payment_factory
+):
+    payment = payment_factory(stripe_checkout_session_id="cs_1")
+    Task.objects.filter(pk=payment.task_id).update(status=Task.TaskStatus.CANCELED)
+
+    service = StripeService()
+    service.process_webhook_event(checkout_session_completed("cs_1"))
+
+    payment.refresh_from_db()
+    assert payment.status == Payment.PaymentStatus.SUCCEEDED
+    assert payment.task.status == Task.TaskStatus.CANCELED
+    mock_publish.assert_called_once()
+    assert mock_publish.call_args.kwargs["subject"] == (
+        "Payment received for a task that can't be paid"
+    )
+    assert mock_publish.call_args.kwargs["recipient_list"] == [
+        payment.task.client.email
+    ]
+
+
+@pytest.mark.django_db
+def test_process_webhook_event_checkout_session_completed_payment_not_found():
+    service = StripeService()
+    service.process_webhook_event(checkout_session_completed("cs_missing"))
+
+
+def charge_refunded(amount_refunded, amount=10000):
+    return MagicMock(
         type="charge.refunded",
         data=MagicMock(
             object=MagicMock(
-                id="refund_id",
+                id="ch_1",
+                payment_intent="pi_1",
+                amount=amount,
+                amount_refunded=amount_refunded,
+                refunded=amount_refunded == amount,
             )
         ),
     )
 
+
+@pytest.mark.django_db
+def test_process_webhook_event_charge_refunded(payment_factory):
+    payment = payment_factory(
+        status=Payment.PaymentStatus.SUCCEEDED, stripe_payment_intent_id="pi_1"
+    )
+
+    service = StripeService()
+    service.process_webhook_event(charge_refunded(10000))
+
+    payment.refresh_from_db()
+    assert payment.status == Payment.PaymentStatus.REFUNDED
+
+
+@pytest.mark.django_db
+def test_process_webhook_event_charge_partially_refunded(payment_factory):
+    payment = payment_factory(
+        status=Payment.PaymentStatus.SUCCEEDED, stripe_payment_intent_id="pi_1"
+    )
+
     service = StripeService()
-    service.handle_webhook_event("payload", "sig_header")
+    service.process_webhook_event(charge_refunded(2500))
+
+    payment.refresh_from_db()
+    assert payment.status == Payment.PaymentStatus.SUCCEEDED
 
 
 @pytest.mark.django_db
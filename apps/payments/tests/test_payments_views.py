@@ -0,0 +1,53 @@
+import csv
+import io
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from apps.payments.models import Payment
+
+
+def export_rows(response):
+    content = b"".join(response.streaming_content).decode()
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_payment_export_unauthenticated(api_client):
+    response = api_client.get(reverse("payments:payment-export"))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_payment_export_own_payments(
+    api_client, client_user, random_user, payment_factory
+):
+    own = payment_factory(status=Payment.PaymentStatus.SUCCEEDED)
+    payment_factory(client=random_user)
+    api_client.force_authenticate(client_user)
+
+    response = api_client.get(reverse("payments:payment-export"), {"format": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 'filename="payments.csv"' in response["Content-Disposition"]
+    rows = export_rows(response)
+    assert [row["id"] for row in rows] == [str(own.pk)]
+    assert rows[0]["amount"] == "100.00"
+    assert rows[0]["status"] == Payment.PaymentStatus.SUCCEEDED
+
+
+@pytest.mark.django_db
+def test_payment_export_as_staff(
+    api_client, user_factory, random_user, payment_factory
+):
+    payment_factory()
+    payment_factory(client=random_user)
+    api_client.force_authenticate(user_factory(email="staff@staff.com", is_staff=True))
+
+    response = api_client.get(
+        reverse("payments:payment-export"), HTTP_ACCEPT="text/csv"
+    )
+
+    assert len(export_rows(response)) == 2
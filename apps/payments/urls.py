@@ -1,6 +1,11 @@
 from django.urls import path
 
-from apps.payments.views import PaymentCancelView, PaymentSuccessView, StripeWebhookView
+from apps.payments.views import (
+    PaymentCancelView,
+    PaymentExportView,
+    PaymentSuccessView,
+    StripeWebhookView,
+)
 
 app_name = "payments"
 
@@ -8,4 +13,5 @@ urlpatterns = [
     path("webhook/", StripeWebhookView.as_view(), name="stripe-webhook"),
     path("success/", PaymentSuccessView.as_view(), name="payment-success"),
     path("cancel/", PaymentCancelView.as_view(), name="payment-cancel"),
+    path("export/", PaymentExportView.as_view(), name="payment-export"),
 ]
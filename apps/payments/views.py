@@ -5,11 +5,14 @@ from django.http import HttpResponse
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
-from rest_framework import status
+from rest_framework import filters, generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.export import EXPORT_RENDERERS, ExportMixin
+from apps.payments.models import Payment
 from apps.payments.services import StripeService
 
 logger = logging.getLogger(__name__)
@@ -28,7 +31,11 @@ class PaymentCancelView(View):
 @extend_schema(tags=["Payments"])
 @method_decorator(csrf_exempt, name="dispatch")
 class StripeWebhookView(APIView):
-    @extend_schema(summary="Webhook for stripe")
+    @extend_schema(
+        summary="Webhook for stripe",
+        description="Verifies and stores the event, then acknowledges it. Events "
+        "are processed asynchronously by the `process_stripe_events` workers.",
+    )
     def post(self, request, *args, **kwargs):
         payload = request.body
         sig_header = request.META.get("HTTP_STRIPE_SIGNATURE")
@@ -36,7 +43,7 @@ class StripeWebhookView(APIView):
         stripe_service = StripeService()
         try:
             stripe_service.handle_webhook_event(payload, sig_header)
-            logger.info("Stripe webhook event successfully processed.")
+            logger.info("Stripe webhook event successfully stored.")
         except ValueError as e:
             logger.error(f"Invalid payload for Stripe webhook: {e}")
             return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
@@ -44,7 +51,42 @@ class StripeWebhookView(APIView):
             logger.error(f"Invalid signature for Stripe webhook: {e}")
             return Response(str(e), status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Error processing Stripe webhook event: {e}", exc_info=True)
+            logger.error(f"Error storing Stripe webhook event: {e}", exc_info=True)
             return Response(str(e), status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return Response(status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Payments"])
+class PaymentExportView(ExportMixin, generics.GenericAPIView):
+    queryset = Payment.objects.all()
+    renderer_classes = EXPORT_RENDERERS
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ["status", "task"]
+    ordering_fields = ["created_at", "amount"]
+    export_fields = [
+        "id",
+        "task",
+        "client",
+        "amount",
+        "status",
+        "stripe_checkout_session_id",
+        "stripe_payment_intent_id",
+        "created_at",
+        "updated_at",
+    ]
+
+    def get_queryset(self):
+        if self.request.user.is_staff:
+            return self.queryset
+        return self.queryset.filter(client=self.request.user)
+
+    @extend_schema(
+        summary="Export payments",
+        description="Streams the payments of the user, or every payment for staff, "
+        "as NDJSON (default) or CSV, chosen with the `Accept` header or "
+        "`?format=ndjson|csv`. Not paginated.",
+        responses={(200, "application/x-ndjson"): bytes, (200, "text/csv"): bytes},
+    )
+    def get(self, request, *args, **kwargs):
+        return self.export_response()
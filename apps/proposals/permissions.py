@@ -20,7 +20,7 @@ class IsFreelancerOfProposal(BasePermission):
     message = "You are not the freelancer of this proposal."
 
     def has_object_permission(self, request, view, proposal):
-        return proposal.freelancer == request.user
+        return proposal.freelancer_id == request.user.pk
 
 
 class IsClientOfTask(BasePermission):
@@ -29,8 +29,7 @@ class IsClientOfTask(BasePermission):
     message = "You are not the client of this task."
 
     def has_object_permission(self, request, view, proposal):
-        task = view.get_task()
-        return task.client == request.user
+        return view.get_task().client_id == request.user.pk
 
 
 class IsTaskOpen(BasePermission):
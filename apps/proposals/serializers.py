@@ -1,9 +1,18 @@
 from rest_framework import serializers
 
+from apps.core.serializers import ExpandableFieldsMixin, SparseFieldsetsMixin
+from apps.users.serializers import UserPublicSerializer
+
 from .models import Proposal
 
 
-class ProposalSerializer(serializers.ModelSerializer):
+class ProposalSerializer(
+    SparseFieldsetsMixin, ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    expandable_fields = {
+        "freelancer": UserPublicSerializer,
+    }
+
     class Meta:
         model = Proposal
         fields = (
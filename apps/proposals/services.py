@@ -1,13 +1,18 @@
 import logging
 
-from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
 
-from apps.core.tasks import send_email_notification
+from apps.core import outbox
+from apps.core.tasks import send_email_notification, send_mass_email_notification
 
 from .models import Proposal
 
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+
 
 @transaction.atomic
 def accept_proposal(proposal: Proposal) -> None:
@@ -26,32 +31,60 @@ def accept_proposal(proposal: Proposal) -> None:
     )
 
     # Send email to the freelancer whose proposal was accepted
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Proposal Accepted!",
         message=f"Your proposal for task '{proposal.task.title}' has been accepted!",
         recipient_list=[proposal.freelancer.email],
     )
 
-    # Send email to other freelancers whose proposals were rejected
-    proposals_to_reject = Proposal.objects.filter(task=proposal.task).exclude(
-        pk=proposal.pk
-    )
-    proposals_to_reject.update(status=Proposal.ProposalStatus.REJECTED)
-    for rejected_proposal in proposals_to_reject:
+    # Send one email job to all freelancers whose proposals were rejected
+    rejected_freelancer_ids = _reject_other_proposals(proposal)
+    if rejected_freelancer_ids:
+        recipient_list = list(
+            User.objects.filter(pk__in=rejected_freelancer_ids).values_list(
+                "email", flat=True
+            )
+        )
         logger.info(
-            f"Proposal for task '{rejected_proposal.task.title}' "
-            f"from {rejected_proposal.freelancer.email} "
-            f"rejected by {rejected_proposal.task.client.email}."
+            f"{len(recipient_list)} other proposals for task '{proposal.task.title}' "
+            f"rejected by {proposal.task.client.email}."
         )
-        send_email_notification.delay(
+        outbox.publish(
+            send_mass_email_notification,
             subject="Proposal Rejected",
-            message=(
-                f"Your proposal for task '{rejected_proposal.task.title}' was rejected."
-            ),
-            recipient_list=[rejected_proposal.freelancer.email],
+            message=f"Your proposal for task '{proposal.task.title}' was rejected.",
+            recipient_list=recipient_list,
+        )
+
+
+def _reject_other_proposals(proposal: Proposal) -> list[int]:
+    """
+    Rejects every other rejectable proposal of the task with a single
+    UPDATE ... RETURNING and returns the ids of their freelancers.
+    """
+
+    table = connection.ops.quote_name(Proposal._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table}
+            SET status = %s, updated_at = %s
+            WHERE task_id = %s AND id <> %s AND status = ANY(%s)
+            RETURNING freelancer_id
+            """,
+            [
+                Proposal.ProposalStatus.REJECTED,
+                timezone.now(),
+                proposal.task_id,
+                proposal.pk,
+                list(Proposal.reject._django_fsm.transitions),
+            ],
         )
+        return [freelancer_id for (freelancer_id,) in cursor.fetchall()]
 
 
+@transaction.atomic
 def reject_proposal(proposal: Proposal) -> None:
     """Rejects a proposal and sends an email notification."""
 
@@ -62,7 +95,8 @@ def reject_proposal(proposal: Proposal) -> None:
         f"rejected by {proposal.task.client.email}."
     )
 
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Proposal Rejected",
         message=f"Your proposal for task '{proposal.task.title}' was rejected.",
         recipient_list=[proposal.freelancer.email],
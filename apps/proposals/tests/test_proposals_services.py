@@ -3,6 +3,7 @@ from unittest.mock import patch
 import pytest
 from django.contrib.auth import get_user_model
 
+from apps.core.tasks import send_mass_email_notification
 from apps.proposals import services
 from apps.proposals.models import Proposal
 
@@ -10,8 +11,8 @@ User = get_user_model()
 
 
 @pytest.mark.django_db
-@patch("apps.proposals.services.send_email_notification.delay")
-def test_accept_proposal(mock_send_email_notification, user_factory, proposal_factory):
+@patch("apps.proposals.services.outbox.publish")
+def test_accept_proposal(mock_publish, user_factory, proposal_factory):
     freelancer1 = user_factory(email="f1@f1.com", role=User.UserRole.FREELANCER)
     freelancer2 = user_factory(email="f2@f2.com", role=User.UserRole.FREELANCER)
 
@@ -27,16 +28,40 @@ def test_accept_proposal(mock_send_email_notification, user_factory, proposal_fa
     assert proposal.status == Proposal.ProposalStatus.ACCEPTED
     assert proposal.task.freelancer == proposal.freelancer
     assert other_proposal.status == Proposal.ProposalStatus.REJECTED
-    assert mock_send_email_notification.call_count == 2
+    assert mock_publish.call_count == 2
 
 
 @pytest.mark.django_db
-@patch("apps.proposals.services.send_email_notification.delay")
-def test_reject_proposal(mock_send_email_notification, proposal_factory):
+@patch("apps.proposals.services.outbox.publish")
+def test_accept_proposal_sends_one_job_for_rejected_proposals(
+    mock_publish, user_factory, proposal_factory
+):
+    proposal = proposal_factory()
+    emails = [f"f{i}@f{i}.com" for i in range(3)]
+    for email in emails:
+        proposal_factory(
+            task=proposal.task,
+            freelancer=user_factory(email=email, role=User.UserRole.FREELANCER),
+        )
+
+    services.accept_proposal(proposal)
+
+    assert mock_publish.call_count == 2
+    task, kwargs = mock_publish.call_args.args[0], mock_publish.call_args.kwargs
+    assert task == send_mass_email_notification
+    assert sorted(kwargs["recipient_list"]) == emails
+    assert not Proposal.objects.filter(
+        task=proposal.task, status=Proposal.ProposalStatus.PENDING
+    ).exists()
+
+
+@pytest.mark.django_db
+@patch("apps.proposals.services.outbox.publish")
+def test_reject_proposal(mock_publish, proposal_factory):
     proposal = proposal_factory()
 
     services.reject_proposal(proposal)
 
     proposal.refresh_from_db()
     assert proposal.status == Proposal.ProposalStatus.REJECTED
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
@@ -1,5 +1,9 @@
+import json
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
@@ -112,6 +116,66 @@ def test_proposal_list_order_by_created_at_asc(api_client, client_user, proposal
     assert created_at_list == sorted(created_at_list)
 
 
+@pytest.mark.django_db
+def test_proposal_list_expand_freelancer(
+    api_client, client_user, proposals, django_assert_num_queries
+):
+    api_client.force_authenticate(client_user)
+
+    with django_assert_num_queries(3):
+        response = api_client.get(
+            reverse("tasks:task-proposals-list", args=[proposals[0].task.pk]),
+            {"expand": "freelancer"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {
+        proposal_data["freelancer"]["email"]
+        for proposal_data in response.data.get("results")
+    } == {proposal.freelancer.email for proposal in proposals}
+
+
+@pytest.mark.django_db
+def test_proposal_list_does_not_join_task(api_client, client_user, proposals):
+    api_client.force_authenticate(client_user)
+    with CaptureQueriesContext(connection) as captured:
+        response = api_client.get(
+            reverse("tasks:task-proposals-list", args=[proposals[0].task.pk])
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any('JOIN "tasks_task"' in q["sql"] for q in captured)
+
+
+# export
+
+
+@pytest.mark.django_db
+def test_proposal_export_filter_by_status(api_client, client_user, proposals):
+    api_client.force_authenticate(client_user)
+    response = api_client.get(
+        reverse("tasks:task-proposals-export", args=[proposals[0].task.pk]),
+        {"status": Proposal.ProposalStatus.PENDING},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    rows = [
+        json.loads(line) for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert {row["id"] for row in rows} == {
+        p.pk for p in proposals if p.status == Proposal.ProposalStatus.PENDING
+    }
+    assert {row["task"] for row in rows} == {proposals[0].task.pk}
+
+
+@pytest.mark.django_db
+def test_proposal_export_task_not_found(api_client, client_user):
+    api_client.force_authenticate(client_user)
+    response = api_client.get(reverse("tasks:task-proposals-export", args=[0]))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 # create
 
 
@@ -197,6 +261,19 @@ def test_proposal_retrieve_not_found(api_client, freelancer_user):
     assert "id" not in response.data
 
 
+@pytest.mark.django_db
+def test_proposal_retrieve_of_other_task_not_found(
+    api_client, client_user, proposal_factory, task_factory
+):
+    proposal = proposal_factory()
+    api_client.force_authenticate(client_user)
+    response = api_client.get(
+        reverse("tasks:task-proposals-detail", args=[task_factory().pk, proposal.pk])
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 def test_proposal_retrieve_unauthenticated(api_client, proposal_factory):
     proposal = proposal_factory()
     response = api_client.get(
@@ -255,9 +332,56 @@ def test_proposal_retrieve_as_random_user_fail(
     assert "id" not in response.data
 
 
+@pytest.mark.django_db
+def test_proposal_retrieve_not_modified(api_client, freelancer_user, proposal_factory):
+    proposal = proposal_factory()
+    api_client.force_authenticate(freelancer_user)
+    url = reverse("tasks:task-proposals-detail", args=[proposal.task.pk, proposal.pk])
+    etag = api_client.get(url).headers["ETag"]
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_proposal_retrieve_not_modified_as_random_user_fail(
+    api_client, freelancer_user, random_user, proposal_factory
+):
+    proposal = proposal_factory()
+    api_client.force_authenticate(freelancer_user)
+    url = reverse("tasks:task-proposals-detail", args=[proposal.task.pk, proposal.pk])
+    etag = api_client.get(url).headers["ETag"]
+
+    api_client.force_authenticate(random_user)
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 # update
 
 
+@pytest.mark.django_db
+def test_proposal_update_loads_task_with_proposal(
+    api_client, freelancer_user, proposal_factory
+):
+    proposal = proposal_factory()
+    api_client.force_authenticate(freelancer_user)
+    with CaptureQueriesContext(connection) as captured:
+        response = api_client.patch(
+            reverse(
+                "tasks:task-proposals-detail", args=[proposal.task.pk, proposal.pk]
+            ),
+            {"message": "Updated"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    task_lookups = [q["sql"] for q in captured if '"tasks_task"' in q["sql"]]
+    assert len(task_lookups) == 1
+    assert "JOIN" in task_lookups[0]
+
+
 @pytest.mark.django_db
 def test_proposal_update_not_found(api_client, freelancer_user):
     api_client.force_authenticate(freelancer_user)
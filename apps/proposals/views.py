@@ -1,6 +1,6 @@
 import logging
 
-from django.shortcuts import get_object_or_404
+from django.db.models import Q
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import (
     extend_schema,
@@ -11,11 +11,18 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core.export import EXPORT_RENDERERS, ExportMixin
+from apps.core.views import (
+    ConditionalRetrieveMixin,
+    ExpandRelatedMixin,
+    ReplicaReadMixin,
+)
+from apps.tasks.mixins import TaskNestedViewSetMixin
 from apps.tasks.permissions import IsTaskOpen
 from apps.users.permissions import IsFreelancer
 
 from . import services
-from .models import Proposal, Task
+from .models import Proposal
 from .permissions import (
     IsClientOfTask,
     IsFreelancerOfProposal,
@@ -37,7 +44,8 @@ logger = logging.getLogger(__name__)
         summary="Retrieve a proposal for a specific task",
         description="Retrieves the details of a specific proposal associated with a "
         "task. Accessible by the client of the task or the freelancer who created the "
-        "proposal.",
+        "proposal. Supports conditional requests with `If-None-Match` and "
+        "`If-Modified-Since`.",
     ),
     create=extend_schema(
         summary="Create a new proposal for a task",
@@ -59,7 +67,14 @@ logger = logging.getLogger(__name__)
         "can delete it, and only if the proposal is pending.",
     ),
 )
-class ProposalViewSet(viewsets.ModelViewSet):
+class ProposalViewSet(
+    ReplicaReadMixin,
+    ConditionalRetrieveMixin,
+    TaskNestedViewSetMixin,
+    ExpandRelatedMixin,
+    ExportMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Proposal.objects.all()
     serializer_class = ProposalSerializer
     filter_backends = [
@@ -70,14 +85,15 @@ class ProposalViewSet(viewsets.ModelViewSet):
     filterset_fields = ["status", "freelancer"]
     search_fields = ["message"]
     ordering_fields = ["created_at", "updated_at"]
+    export_fields = list(ProposalSerializer.Meta.fields)
 
-    def get_task(self):
-        if not hasattr(self, "_task"):
-            self._task = get_object_or_404(Task, pk=self.kwargs.get("task_pk"))
-        return self._task
-
-    def get_queryset(self):
-        return self.queryset.filter(task=self.get_task())
+    def get_conditional_queryset(self):
+        # same proposals the retrieve permissions let through, without
+        # loading the task first
+        user = self.request.user
+        return Proposal.objects.filter(task_id=self.kwargs.get("task_pk")).filter(
+            Q(task__client=user) | Q(freelancer=user)
+        )
 
     def get_permissions(self):
         permissions = [IsAuthenticated]
@@ -130,3 +146,17 @@ class ProposalViewSet(viewsets.ModelViewSet):
         proposal = self.get_object()
         services.reject_proposal(proposal)
         return Response(self.get_serializer(proposal).data)
+
+    @extend_schema(
+        summary="Export proposals for a specific task",
+        description="Streams every proposal of the task matching the list "
+        "filters, search and ordering as NDJSON (default) or CSV, chosen with the "
+        "`Accept` header or `?format=ndjson|csv`. Not paginated. Accessible by "
+        "authenticated users.",
+        responses={(200, "application/x-ndjson"): bytes, (200, "text/csv"): bytes},
+    )
+    @action(detail=False, methods=["get"], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request, *args, **kwargs):
+        # 404 for a missing task, like the list
+        self.get_task()
+        return self.export_response()
@@ -10,7 +10,10 @@ class IsUserAssociatedWithTask(BasePermission):
 
     def has_permission(self, request, view):
         task = view.get_task()
-        return request.user in [task.client, task.freelancer]
+        return request.user.is_authenticated and request.user.pk in (
+            task.client_id,
+            task.freelancer_id,
+        )
 
 
 class IsTaskCompleted(BasePermission):
@@ -30,7 +33,7 @@ class IsFreelancerAssignedToTask(BasePermission):
 
     def has_permission(self, request, view):
         task = view.get_task()
-        return task.freelancer is not None
+        return task.freelancer_id is not None
 
 
 class IsReviewCreator(BasePermission):
@@ -39,4 +42,4 @@ class IsReviewCreator(BasePermission):
     message = "You are not the creator of this review."
 
     def has_object_permission(self, request, view, review):
-        return review.reviewer == request.user
+        return review.reviewer_id == request.user.pk
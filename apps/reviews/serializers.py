@@ -1,9 +1,19 @@
 from rest_framework import serializers
 
+from apps.core.serializers import ExpandableFieldsMixin, SparseFieldsetsMixin
+from apps.users.serializers import UserPublicSerializer
+
 from .models import Review
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsetsMixin, ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    expandable_fields = {
+        "reviewer": UserPublicSerializer,
+        "recipient": UserPublicSerializer,
+    }
+
     class Meta:
         model = Review
         fields = (
@@ -1,23 +1,36 @@
 import logging
 
-from django.db.models import Avg
+from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.users.models import average_rating_expression
 
 from .models import Review
 
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+
 
 @receiver(post_save, sender=Review)
 def update_user_average_rating(sender, instance, created, **kwargs):
+    """
+    Folds the new rating into the recipient's counters with a single atomic
+    UPDATE, so the cost does not grow with the number of received reviews.
+    """
+
     if created:
-        recipient = instance.recipient
-        average_rating = recipient.received_reviews.aggregate(Avg("rating"))[
-            "rating__avg"
-        ]
-        recipient.average_rating = average_rating
-        recipient.save()
-        logger.info(
-            f"Updated average rating for {recipient.email} to {average_rating}."
+        User.objects.filter(pk=instance.recipient_id).update(
+            rating_sum=F("rating_sum") + instance.rating,
+            rating_count=F("rating_count") + 1,
+            # the right-hand side sees the pre-update counters
+            average_rating=average_rating_expression(
+                F("rating_sum") + instance.rating, F("rating_count") + 1
+            ),
+            # `update()` skips auto_now, keep conditional requests in sync
+            updated_at=timezone.now(),
         )
+        logger.info(f"Updated average rating for user #{instance.recipient_id}.")
@@ -36,3 +36,29 @@ def test_update_user_average_rating_on_review_creation(
     )
     recipient.refresh_from_db()
     assert recipient.average_rating == 4.0
+
+
+@pytest.mark.django_db
+def test_update_user_average_rating_updates_counters(
+    user_factory, task_factory, review_factory
+):
+    recipient = user_factory(email="recipient@test.com")
+    reviewer = user_factory(email="reviewer@test.com")
+
+    review_factory(
+        task=task_factory(client=recipient),
+        reviewer=reviewer,
+        recipient=recipient,
+        rating=4,
+    )
+    review_factory(
+        task=task_factory(client=recipient),
+        reviewer=reviewer,
+        recipient=recipient,
+        rating=1,
+    )
+
+    recipient.refresh_from_db()
+    assert recipient.rating_sum == 5
+    assert recipient.rating_count == 2
+    assert recipient.average_rating == 2.5
@@ -37,6 +37,35 @@ def test_review_list_success(api_client, reviews):
     assert response.data.get("count") == 2  # Only two reviews for the first task
 
 
+@pytest.mark.django_db
+def test_review_list_expand_users(api_client, reviews, django_assert_num_queries):
+    api_client.force_authenticate(reviews[0].task.client)
+
+    with django_assert_num_queries(3):
+        response = api_client.get(
+            reverse("tasks:task-reviews-list", args=[reviews[0].task.pk]),
+            {"expand": "reviewer,recipient"},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    for review_data in response.data.get("results"):
+        review = Review.objects.get(pk=review_data["id"])
+        assert review_data["reviewer"]["id"] == review.reviewer_id
+        assert review_data["recipient"]["id"] == review.recipient_id
+
+
+@pytest.mark.django_db
+def test_review_list_does_not_join_task(api_client, reviews, django_assert_num_queries):
+    api_client.force_authenticate(reviews[0].task.client)
+    with django_assert_num_queries(3) as captured:
+        response = api_client.get(
+            reverse("tasks:task-reviews-list", args=[reviews[0].task.pk])
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any('JOIN "tasks_task"' in q["sql"] for q in captured)
+
+
 @pytest.mark.django_db
 def test_review_list_task_not_found(api_client, client_user):
     api_client.force_authenticate(client_user)
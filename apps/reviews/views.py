@@ -1,12 +1,12 @@
 import logging
 
-from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import filters, mixins, viewsets
 from rest_framework.permissions import IsAuthenticated
 
-from apps.tasks.models import Task
+from apps.core.views import ExpandRelatedMixin, ReplicaReadMixin
+from apps.tasks.mixins import TaskNestedViewSetMixin
 
 from .models import Review
 from .permissions import (
@@ -39,6 +39,9 @@ logger = logging.getLogger(__name__)
     ),
 )
 class ReviewViewSet(
+    ReplicaReadMixin,
+    TaskNestedViewSetMixin,
+    ExpandRelatedMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
@@ -55,14 +58,6 @@ class ReviewViewSet(
     search_fields = ["comment"]
     ordering_fields = ["created_at", "rating"]
 
-    def get_task(self):
-        if not hasattr(self, "_task"):
-            self._task = get_object_or_404(Task, pk=self.kwargs.get("task_pk"))
-        return self._task
-
-    def get_queryset(self):
-        return self.queryset.filter(task=self.get_task())
-
     def get_permissions(self):
         permissions = [IsAuthenticated]
         if self.action == "create":
@@ -82,7 +77,7 @@ class ReviewViewSet(
     def perform_create(self, serializer):
         task = self.get_task()
         reviewer = self.request.user
-        recipient = task.freelancer if reviewer == task.client else task.client
+        recipient = task.freelancer if reviewer.pk == task.client_id else task.client
         serializer.save(reviewer=reviewer, recipient=recipient, task=task)
         logger.info(
             f"Review for task '{task.title}' created by {reviewer.email} for "
@@ -0,0 +1,45 @@
+import logging
+from urllib.parse import urlencode
+
+import redis
+from django.conf import settings
+
+from apps.core import cache
+
+logger = logging.getLogger(__name__)
+
+LIST_CACHE_NAMESPACE = "tasks:list"
+
+
+def list_cache_key(request, params) -> str:
+    """
+    Builds the cache key of a task list response from the query parameters the
+    list actually reads, so parameter order, blank values and unknown
+    parameters don't fragment the cache. The host is part of the key because
+    pagination links are absolute.
+    """
+
+    normalized = sorted(
+        (name, value)
+        for name in params
+        for value in request.query_params.getlist(name)
+        if value != ""
+    )
+    return cache.make_key(
+        LIST_CACHE_NAMESPACE,
+        request.build_absolute_uri(request.path),
+        urlencode(normalized),
+    )
+
+
+def get_or_compute_list(request, params, compute):
+    try:
+        key = list_cache_key(request, params)
+    except redis.RedisError:
+        logger.warning("Cache unavailable, computing task list.", exc_info=True)
+        return compute()
+    return cache.get_or_compute(key, compute, timeout=settings.TASK_LIST_CACHE_TIMEOUT)
+
+
+def invalidate_list() -> None:
+    cache.invalidate_on_commit(LIST_CACHE_NAMESPACE)
@@ -0,0 +1,92 @@
+from collections import Counter
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from .models import Task, TaskStatusCount
+
+# (client id, previous status, new status), a status is None when the task is
+# created or deleted
+StatusChange = tuple[int, str | None, str | None]
+
+
+def record_status_changes(changes: Iterable[StatusChange]) -> None:
+    """
+    Applies task status changes to the per client and total counters with a
+    single upsert. Call it in the transaction that changes the statuses.
+    """
+
+    deltas = Counter()
+    for client_id, source, target in changes:
+        for scope in (client_id, None):
+            if source is not None:
+                deltas[scope, source] -= 1
+            if target is not None:
+                deltas[scope, target] += 1
+
+    # a stable row order keeps concurrent upserts from deadlocking
+    rows = sorted(
+        (
+            (client_id, status, delta)
+            for (client_id, status), delta in deltas.items()
+            if delta
+        ),
+        key=lambda row: (row[0] is not None, row[0] or 0, row[1]),
+    )
+    if not rows:
+        return
+
+    table = connection.ops.quote_name(TaskStatusCount._meta.db_table)
+    values = ", ".join(["(%s, %s, %s)"] * len(rows))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} AS counter (client_id, status, count)
+            VALUES {values}
+            ON CONFLICT (client_id, status)
+            DO UPDATE SET count = counter.count + EXCLUDED.count
+            """,
+            [value for row in rows for value in row],
+        )
+
+
+def forget_task(client_id: int, status: str) -> None:
+    """
+    Removes a deleted task from the counters. Unlike `record_status_changes`
+    it never inserts, as the client may be being deleted along with the task.
+    """
+
+    TaskStatusCount.objects.filter(
+        Q(client_id=client_id) | Q(client__isnull=True), status=status
+    ).update(count=F("count") - 1)
+
+
+def get_counts(client_id: int | None = None) -> dict[str, int]:
+    """Returns task counts by status, of one client or in total."""
+
+    counts = dict.fromkeys(Task.TaskStatus.values, 0)
+    counts |= dict(
+        TaskStatusCount.objects.filter(client_id=client_id).values_list(
+            "status", "count"
+        )
+    )
+    return counts
+
+
+@transaction.atomic
+def rebuild() -> None:
+    """Recounts every counter from the tasks table."""
+
+    table = connection.ops.quote_name(TaskStatusCount._meta.db_table)
+    tasks_table = connection.ops.quote_name(Task._meta.db_table)
+    with connection.cursor() as cursor:
+        # writers wait until the recount commits instead of being lost
+        cursor.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {table} (client_id, status, count)
+            SELECT client_id, status, COUNT(*)
+            FROM {tasks_table}
+            GROUP BY GROUPING SETS ((client_id, status), (status))
+            """)
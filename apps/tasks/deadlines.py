@@ -0,0 +1,116 @@
+"""
+Upcoming task deadlines, kept in a Redis sorted set of task ids scored by
+the timestamp of their deadline, so the tasks due are read in deadline order
+without scanning the tasks table.
+
+Tasks are added when saved in a status they can expire from and removed
+otherwise (see `apps.tasks.signals`), `apps.tasks.tasks.expire_due_tasks`
+expires the ones due every `TASK_DEADLINES_TICK` seconds. The set may miss
+or hold stale tasks, e.g. if Redis was unreachable: stale ones are dropped
+when they come due, missed ones are expired by the hourly `expire_tasks`
+sweep, and `rebuild_task_deadlines` reloads the set from the database.
+"""
+
+import functools
+import os
+from datetime import datetime
+from typing import Iterable
+
+import redis
+from django.conf import settings
+
+from .models import Task
+
+DEADLINES_KEY = "tasks:deadlines"
+REBUILD_CHUNK_SIZE = 2000
+
+
+@functools.cache
+def get_redis() -> redis.Redis | None:
+    """Client of `TASK_DEADLINES_REDIS_URL`, None when it isn't set."""
+
+    url = settings.TASK_DEADLINES_REDIS_URL
+    return redis.Redis.from_url(url) if url else None
+
+
+# a forked worker must not share the connections of its parent
+os.register_at_fork(after_in_child=get_redis.cache_clear)
+
+
+def expirable_statuses() -> list[str]:
+    return list(Task.expire._django_fsm.transitions)
+
+
+def schedule(deadlines: Iterable[tuple[int, datetime]]) -> None:
+    """Adds or moves the deadlines of (task id, deadline) pairs."""
+
+    client = get_redis()
+    mapping = {task_id: deadline.timestamp() for task_id, deadline in deadlines}
+    if client is not None and mapping:
+        client.zadd(DEADLINES_KEY, mapping)
+
+
+def unschedule(task_ids: Iterable[int]) -> None:
+    client = get_redis()
+    task_ids = list(task_ids)
+    if client is not None and task_ids:
+        client.zrem(DEADLINES_KEY, *task_ids)
+
+
+def due(now: datetime, limit: int) -> list[int]:
+    """Ids of up to `limit` tasks whose deadline is `now` or earlier."""
+
+    client = get_redis()
+    if client is None:
+        return []
+    task_ids = client.zrangebyscore(
+        DEADLINES_KEY, "-inf", now.timestamp(), start=0, num=limit
+    )
+    return [int(task_id) for task_id in task_ids]
+
+
+def rebuild() -> int:
+    """
+    Reloads the set from the tasks that can expire, returns their number.
+
+    The tasks are read into a temporary key, which is then merged into the
+    live set keeping the lower score of each task, so deadlines scheduled
+    while rebuilding are kept. A score lower than the real deadline only
+    makes `expire_due_tasks` check the task early and schedule it again.
+    """
+
+    client = get_redis()
+    if client is None:
+        return 0
+
+    tasks = (
+        Task.objects.filter(status__in=expirable_statuses())
+        .values_list("pk", "deadline")
+        .iterator(chunk_size=REBUILD_CHUNK_SIZE)
+    )
+    rebuilding_key = f"{DEADLINES_KEY}:rebuild"
+    client.delete(rebuilding_key)
+    count = 0
+    for chunk in _chunks(tasks, REBUILD_CHUNK_SIZE):
+        client.zadd(
+            rebuilding_key,
+            {task_id: deadline.timestamp() for task_id, deadline in chunk},
+        )
+        count += len(chunk)
+
+    pipeline = client.pipeline()
+    pipeline.zunionstore(DEADLINES_KEY, [DEADLINES_KEY, rebuilding_key], "MIN")
+    pipeline.delete(rebuilding_key)
+    pipeline.execute()
+    return count
+
+
+def _chunks(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks import counters
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-status task counters from the tasks table."
+
+    def handle(self, *args, **options):
+        counters.rebuild()
+        total = sum(counters.get_counts().values())
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt task status counters of {total} tasks.")
+        )
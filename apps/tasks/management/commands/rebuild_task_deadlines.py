@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks import deadlines
+
+
+class Command(BaseCommand):
+    help = "Reloads the deadline scheduler from the tasks table."
+
+    def handle(self, *args, **options):
+        count = deadlines.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Scheduled the deadlines of {count} tasks.")
+        )
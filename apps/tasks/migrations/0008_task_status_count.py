@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_task_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskStatusCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("open", "Open"),
+                            ("paid", "Paid"),
+                            ("in_progress", "In progress"),
+                            ("pending_review", "Pending review"),
+                            ("completed", "Completed"),
+                            ("canceled", "Canceled"),
+                            ("expired", "Expired"),
+                        ],
+                        help_text="Counted task status.",
+                        max_length=15,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0, help_text="Number of tasks.")),
+                (
+                    "client",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Client whose tasks are counted, empty for all tasks.",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="task_status_counts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("client", "status"),
+                        name="unique_task_status_count",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO tasks_taskstatuscount (client_id, status, count)
+                SELECT client_id, status, COUNT(*)
+                FROM tasks_task
+                GROUP BY GROUPING SETS ((client_id, status), (status))
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
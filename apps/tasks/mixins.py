@@ -0,0 +1,51 @@
+from django.shortcuts import get_object_or_404
+
+from .models import Task
+
+
+class TaskNestedViewSetMixin:
+    """
+    For viewsets nested under a task, with the task's pk in the `task_pk` URL
+    kwarg and a `task` foreign key on the model.
+
+    On detail routes the object and its task are loaded together in one
+    joined query, and that task is the one `get_task` returns to permissions,
+    the serializer context and services. Other routes load the task alone and
+    don't join it into their lists.
+    """
+
+    task_lookup_url_kwarg = "task_pk"
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(task_id=self.kwargs.get(self.task_lookup_url_kwarg))
+        )
+
+    def get_nested_object(self):
+        """Returns the object of a detail route, without checking permissions."""
+
+        if not hasattr(self, "_nested_object"):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            self._nested_object = get_object_or_404(
+                self.filter_queryset(self.get_queryset()).select_related("task"),
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+            )
+        return self._nested_object
+
+    def get_object(self):
+        obj = self.get_nested_object()
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get_task(self) -> Task:
+        if not hasattr(self, "_task"):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            if lookup_url_kwarg in self.kwargs:
+                self._task = self.get_nested_object().task
+            else:
+                self._task = get_object_or_404(
+                    Task, pk=self.kwargs.get(self.task_lookup_url_kwarg)
+                )
+        return self._task
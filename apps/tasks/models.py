@@ -1,4 +1,6 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
 from django_fsm import FSMField, transition
@@ -7,6 +9,16 @@ from apps.core.models import TimeStampModel
 
 User = get_user_model()
 
+SEARCH_CONFIG = "english"
+
+
+class TaskManager(models.Manager):
+    def get_queryset(self):
+        # the search vector is only ever filtered on (see
+        # `apps.tasks.filters.TaskFullTextSearchFilter`), loading it along
+        # with every task would read a document about the size of its text
+        return super().get_queryset().defer("search_vector")
+
 
 class Task(TimeStampModel):
     class TaskStatus(models.TextChoices):
@@ -47,19 +59,37 @@ class Task(TimeStampModel):
         blank=True,
         help_text="User who is assigned to the task.",
     )
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Weighted full-text search document over title and description.",
+    )
+
+    objects = TaskManager()
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["deadline"]),
+            # keyset pagination: one (ordering field, tiebreaker) index per
+            # orderable field, scanned in either direction
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["updated_at", "id"]),
+            models.Index(fields=["price", "id"]),
+            models.Index(fields=["deadline", "id"]),
+            GinIndex(fields=["search_vector"]),
         ]
 
     def __str__(self) -> str:
         return f"Task #{self.pk} '{self.title}' [{self.status}]"
 
     def has_freelancer(self) -> bool:
-        return self.freelancer is not None
+        return self.freelancer_id is not None
 
     @transition(
         field=status,
@@ -101,3 +131,39 @@ class Task(TimeStampModel):
         target=TaskStatus.EXPIRED,
     )
     def expire(self) -> None: ...
+
+
+class TaskStatusCount(models.Model):
+    """
+    Number of tasks in a status, per client and in total (rows without a client).
+    Kept up to date by `apps.tasks.counters` in the transactions that change
+    task statuses, so dashboards don't have to count the tasks table.
+    """
+
+    client = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="task_status_counts",
+        null=True,
+        blank=True,
+        help_text="Client whose tasks are counted, empty for all tasks.",
+    )
+    status = models.CharField(
+        max_length=15,
+        choices=Task.TaskStatus.choices,
+        help_text="Counted task status.",
+    )
+    count = models.IntegerField(default=0, help_text="Number of tasks.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["client", "status"],
+                name="unique_task_status_count",
+                nulls_distinct=False,
+            )
+        ]
+
+    def __str__(self) -> str:
+        scope = f"client #{self.client_id}" if self.client_id else "all"
+        return f"{self.count} {self.status} tasks ({scope})"
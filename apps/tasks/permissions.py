@@ -45,7 +45,7 @@ class IsClientOfTask(BasePermission):
     message = "You are not the client of this task."
 
     def has_object_permission(self, request, view, task):
-        return task.client == request.user
+        return task.client_id == request.user.pk
 
 
 class IsFreelancerOfTask(BasePermission):
@@ -54,7 +54,7 @@ class IsFreelancerOfTask(BasePermission):
     message = "You are not the freelancer of this task."
 
     def has_object_permission(self, request, view, task):
-        return task.freelancer == request.user
+        return task.freelancer_id is not None and task.freelancer_id == request.user.pk
 
 
 class IsFreelancerAssingedToTask(BasePermission):
@@ -63,4 +63,4 @@ class IsFreelancerAssingedToTask(BasePermission):
     message = "This task task no freelancer assigned"
 
     def has_object_permission(self, request, view, task):
-        return task.freelancer is not None
+        return task.freelancer_id is not None
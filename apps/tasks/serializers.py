@@ -1,10 +1,23 @@
 from django.utils import timezone
 from rest_framework import serializers
 
+from apps.core.serializers import ExpandableFieldsMixin, SparseFieldsetsMixin
+from apps.users.serializers import UserPublicSerializer
+
 from .models import Task
 
+# characters of the description included in task lists
+LIST_DESCRIPTION_LENGTH = 300
+
+
+class TaskSerializer(
+    SparseFieldsetsMixin, ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    expandable_fields = {
+        "client": UserPublicSerializer,
+        "freelancer": UserPublicSerializer,
+    }
 
-class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = (
@@ -31,3 +44,12 @@ class TaskSerializer(serializers.ModelSerializer):
         if value < timezone.now():
             raise serializers.ValidationError("Deadline must be in the future.")
         return value
+
+
+class TaskListSerializer(TaskSerializer):
+    """
+    Task representation in lists: the description is cut to its first
+    `LIST_DESCRIPTION_LENGTH` characters by the query, see `TaskViewSet`.
+    """
+
+    description = serializers.CharField(source="description_snippet", read_only=True)
@@ -1,93 +1,103 @@
 import logging
 
+from django.db import transaction
+
+from apps.core import outbox
 from apps.core.tasks import send_email_notification
 from apps.users.models import User
 
 from .models import Task
+from .transitions import transition_or_conflict
 
 logger = logging.getLogger(__name__)
 
 
+@transaction.atomic
 def start_task(task: Task) -> None:
     """Starts a task and sends an email notification."""
 
-    task.start()
-    task.save()
+    transition_or_conflict(task, task.start)
     logger.info(f"Task '{task.title}' started by {task.freelancer.email}.")
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Task Started",
         message=f"Task '{task.title}' was started by {task.freelancer}.",
         recipient_list=[task.client.email],
     )
 
 
+@transaction.atomic
 def pay_task(task: Task) -> None:
     """Marks a task as paid and sends an email notification."""
 
-    task.pay()
-    task.save()
+    transition_or_conflict(task, task.pay)
     logger.info(f"Task '{task.title}' paid by {task.client.email}.")
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Task Paid",
         message=f"Task '{task.title}' was paid by {task.client}.",
         recipient_list=[task.client.email, task.freelancer.email],
     )
 
 
+@transaction.atomic
 def submit_task(task: Task) -> None:
     """Submits a task for review and sends an email notification."""
 
-    task.begin_review()
-    task.save()
+    transition_or_conflict(task, task.begin_review)
     logger.info(f"Task '{task.title}' submitted by {task.freelancer.email}.")
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Task Submitted",
         message=f"Task '{task.title}' was submitted by {task.freelancer}.",
         recipient_list=[task.client.email],
     )
 
 
+@transaction.atomic
 def approve_task_submission(task: Task) -> None:
     """Approves a task submission and sends an email notification."""
 
-    task.complete()
-    task.save()
+    transition_or_conflict(task, task.complete)
     logger.info(f"Task '{task.title}' approved by {task.client.email}.")
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Task Approved",
         message=f"Task '{task.title}' was approved by {task.client}.",
         recipient_list=[task.freelancer.email],
     )
 
 
+@transaction.atomic
 def reject_task_submission(task: Task) -> None:
     """Rejects a task submission and sends an email notification."""
 
-    task.reject()
-    task.save()
+    transition_or_conflict(task, task.reject)
     logger.info(f"Task '{task.title}' rejected by {task.client.email}.")
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Task Rejected",
         message=f"Task '{task.title}' was rejected by {task.client}.",
         recipient_list=[task.freelancer.email],
     )
 
 
+@transaction.atomic
 def cancel_task(task: Task, user: User) -> None:
     """Cancels a task and sends an email notification."""
 
-    task.cancel()
-    task.save()
+    transition_or_conflict(task, task.cancel)
     logger.info(f"Task '{task.title}' canceled by {user.email}.")
 
-    if user == task.client:
+    if user.pk == task.client_id:
         recipient_list = [task.freelancer.email]
         message = f"Task '{task.title}' was canceled by the client."
     else:
         recipient_list = [task.client.email]
         message = f"Task '{task.title}' was canceled by the freelancer."
 
-    send_email_notification.delay(
+    outbox.publish(
+        send_email_notification,
         subject="Task Canceled",
         message=message,
         recipient_list=recipient_list,
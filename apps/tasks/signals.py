@@ -0,0 +1,79 @@
+import logging
+from functools import partial
+
+import redis
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django_fsm.signals import post_transition
+
+from . import counters, deadlines
+from .cache import invalidate_list
+from .models import Task
+
+# Sent once per task expired by the set-based sweep in `apps.tasks.tasks`,
+# which never loads model instances and therefore bypasses django_fsm's
+# `post_transition`. Receivers get `task_id`, `source` and `target`, and run
+# inside the transaction of the batch that expired the task.
+task_expired = Signal()
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_transition, sender=Task)
+@receiver(task_expired)
+def invalidate_task_list_cache(sender, **kwargs):
+    """Drops cached task lists once the change commits."""
+
+    invalidate_list()
+
+
+@receiver(post_save, sender=Task)
+def count_created_task(sender, instance, created, **kwargs):
+    if created:
+        counters.record_status_changes([(instance.client_id, None, instance.status)])
+
+
+@receiver(post_transition, sender=Task)
+def count_task_transition(sender, instance, source, target, **kwargs):
+    # sent in the transaction that writes the new status
+    if source != target:
+        counters.record_status_changes([(instance.client_id, source, target)])
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    counters.forget_task(instance.client_id, instance.status)
+
+
+def _sync_deadline_on_commit(task_id: int, update) -> None:
+    def sync():
+        try:
+            update()
+        except redis.RedisError:
+            # the hourly sweep still expires the task
+            logger.warning(
+                f"Couldn't update the deadline of task #{task_id}.", exc_info=True
+            )
+
+    transaction.on_commit(sync)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_transition, sender=Task)
+def schedule_task_deadline(sender, instance, **kwargs):
+    """Keeps the deadline scheduler in sync once the change commits."""
+
+    if instance.status in deadlines.expirable_statuses():
+        deadline = Task._meta.get_field("deadline").to_python(instance.deadline)
+        update = partial(deadlines.schedule, [(instance.pk, deadline)])
+    else:
+        update = partial(deadlines.unschedule, [instance.pk])
+    _sync_deadline_on_commit(instance.pk, update)
+
+
+@receiver(post_delete, sender=Task)
+def unschedule_task_deadline(sender, instance, **kwargs):
+    _sync_deadline_on_commit(instance.pk, partial(deadlines.unschedule, [instance.pk]))
@@ -1,27 +1,107 @@
 import logging
 
 from celery import shared_task
+from django.db import connection, transaction
 from django.utils import timezone
 
+from . import counters, deadlines
 from .models import Task
+from .signals import task_expired
 
 logger = logging.getLogger(__name__)
 
+EXPIRE_BATCH_SIZE = 1000
+
+
+def _expire_batch(
+    now, sources: list[str], target: str, limit: int, task_ids: list[int] | None
+) -> list[tuple]:
+    """
+    Expires up to `limit` overdue tasks, among `task_ids` if given, with a
+    single UPDATE ... RETURNING. Rows locked by a concurrent sweep are skipped
+    rather than waited on.
+    Returns (id, title, client id, previous status) of every expired task.
+    """
+
+    table = connection.ops.quote_name(Task._meta.db_table)
+    among = "AND id = ANY(%s)" if task_ids is not None else ""
+    params = [sources, now] + ([task_ids] if task_ids is not None else [])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH batch AS (
+                SELECT id, status FROM {table}
+                WHERE status = ANY(%s) AND deadline < %s {among}
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE {table} AS task
+            SET status = %s, updated_at = %s
+            FROM batch
+            WHERE task.id = batch.id
+            RETURNING task.id, task.title, task.client_id, batch.status
+            """,
+            [*params, limit, target, now],
+        )
+        return cursor.fetchall()
+
+
+def _expire(now, limit: int, task_ids: list[int] | None = None) -> int:
+    """Expires a batch of tasks, see `_expire_batch`. Returns its size."""
+
+    sources = deadlines.expirable_statuses()
+    target = Task.TaskStatus.EXPIRED
+    with transaction.atomic():
+        expired = _expire_batch(now, sources, target, limit, task_ids)
+        counters.record_status_changes(
+            (client_id, source, target) for _, _, client_id, source in expired
+        )
+        for task_id, title, _, source in expired:
+            task_expired.send(
+                sender=Task, task_id=task_id, source=source, target=target
+            )
+            logger.info(f"Task '{title}' has expired.")
+    return len(expired)
+
 
 @shared_task
 def expire_tasks() -> None:
-    """Expire tasks that are past their deadline."""
+    """
+    Expire tasks that are past their deadline, in bounded set-based batches.
+    Runs hourly as a safety net for the tasks `expire_due_tasks` missed.
+    """
     now = timezone.now()
-    tasks_to_expire = Task.objects.filter(
-        deadline__lt=now,
-        status__in=[
-            Task.TaskStatus.OPEN,
-            Task.TaskStatus.PAID,
-            Task.TaskStatus.IN_PROGRESS,
-        ],
+
+    expired_count = 0
+    while True:
+        expired = _expire(now, EXPIRE_BATCH_SIZE)
+        expired_count += expired
+        if expired < EXPIRE_BATCH_SIZE:
+            break
+
+    logger.info(f"Expired {expired_count} tasks.")
+
+
+@shared_task
+def expire_due_tasks() -> None:
+    """
+    Expire the tasks due according to the deadline scheduler (see
+    `apps.tasks.deadlines`), one batch every `TASK_DEADLINES_TICK` seconds
+    (see `config.celery`).
+    """
+    now = timezone.now()
+    task_ids = deadlines.due(now, EXPIRE_BATCH_SIZE)
+    if not task_ids:
+        return
+
+    expired = _expire(now, EXPIRE_BATCH_SIZE, task_ids)
+    deadlines.unschedule(task_ids)
+    # the tasks left were skipped while locked or got another deadline in the
+    # meantime, schedule them again from what the database holds now
+    deadlines.schedule(
+        Task.objects.filter(
+            pk__in=task_ids, status__in=deadlines.expirable_statuses()
+        ).values_list("pk", "deadline")
     )
-    logger.info(f"Found {tasks_to_expire.count()} tasks to expire.")
-    for task in tasks_to_expire:
-        task.expire()
-        task.save()
-        logger.info(f"Task '{task.title}' has expired.")
+    logger.info(f"Expired {expired} of {len(task_ids)} tasks due.")
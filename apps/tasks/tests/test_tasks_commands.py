@@ -0,0 +1,17 @@
+import pytest
+from django.core.management import call_command
+
+from apps.tasks import counters
+from apps.tasks.models import Task, TaskStatusCount
+
+
+@pytest.mark.django_db
+def test_rebuild_task_counters(task_factory, client_user):
+    task_factory()
+    task_factory(status=Task.TaskStatus.PAID)
+    TaskStatusCount.objects.all().delete()
+
+    call_command("rebuild_task_counters")
+
+    assert counters.get_counts()[Task.TaskStatus.OPEN] == 1
+    assert counters.get_counts(client_user.pk)[Task.TaskStatus.PAID] == 1
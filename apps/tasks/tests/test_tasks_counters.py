@@ -0,0 +1,62 @@
+import pytest
+
+from apps.tasks import counters
+from apps.tasks.models import Task, TaskStatusCount
+
+
+@pytest.mark.django_db
+def test_counters_count_created_tasks(task_factory, client_user, random_user):
+    task_factory()
+    task_factory()
+    task_factory(client=random_user, status=Task.TaskStatus.PAID)
+
+    assert counters.get_counts()[Task.TaskStatus.OPEN] == 2
+    assert counters.get_counts()[Task.TaskStatus.PAID] == 1
+    assert counters.get_counts(client_user.pk)[Task.TaskStatus.OPEN] == 2
+    assert counters.get_counts(client_user.pk)[Task.TaskStatus.PAID] == 0
+    assert counters.get_counts(random_user.pk)[Task.TaskStatus.PAID] == 1
+
+
+@pytest.mark.django_db
+def test_counters_follow_transitions(task_factory, client_user):
+    task = task_factory()
+
+    task.cancel()
+    task.save()
+
+    assert counters.get_counts()[Task.TaskStatus.OPEN] == 0
+    assert counters.get_counts()[Task.TaskStatus.CANCELED] == 1
+    assert counters.get_counts(client_user.pk)[Task.TaskStatus.CANCELED] == 1
+
+
+@pytest.mark.django_db
+def test_counters_forget_deleted_tasks(task_factory, client_user):
+    task_factory().delete()
+
+    assert counters.get_counts()[Task.TaskStatus.OPEN] == 0
+    assert counters.get_counts(client_user.pk)[Task.TaskStatus.OPEN] == 0
+
+
+@pytest.mark.django_db
+def test_counters_survive_client_deletion(task_factory, random_user):
+    task_factory()
+    task_factory(client=random_user)
+    random_user_id = random_user.pk
+
+    random_user.delete()
+
+    assert counters.get_counts()[Task.TaskStatus.OPEN] == 1
+    assert not TaskStatusCount.objects.filter(client_id=random_user_id).exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_counters(task_factory, client_user):
+    task_factory()
+    task_factory(status=Task.TaskStatus.COMPLETED)
+    TaskStatusCount.objects.update(count=100)
+
+    counters.rebuild()
+
+    assert counters.get_counts()[Task.TaskStatus.OPEN] == 1
+    assert counters.get_counts()[Task.TaskStatus.COMPLETED] == 1
+    assert counters.get_counts(client_user.pk)[Task.TaskStatus.OPEN] == 1
@@ -0,0 +1,206 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.tasks import deadlines, services
+from apps.tasks.models import Task
+from apps.tasks.tasks import expire_due_tasks
+from apps.tasks.transitions import apply_transition
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    with patch("apps.tasks.deadlines.get_redis", return_value=client):
+        yield client
+
+
+def scheduled(redis_client) -> dict:
+    """Deadline timestamps by task id of every `zadd` call."""
+
+    return {
+        task_id: score
+        for call in redis_client.zadd.call_args_list
+        for task_id, score in call.args[1].items()
+    }
+
+
+@pytest.mark.django_db
+def test_get_redis_is_disabled_without_url(settings):
+    settings.TASK_DEADLINES_REDIS_URL = ""
+    deadlines.get_redis.cache_clear()
+
+    try:
+        assert deadlines.get_redis() is None
+        assert deadlines.due(timezone.now(), 10) == []
+    finally:
+        deadlines.get_redis.cache_clear()
+
+
+@pytest.mark.django_db
+def test_task_create_schedules_deadline(
+    redis_client, task_factory, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        task = task_factory()
+
+    task.refresh_from_db()
+    assert scheduled(redis_client) == {task.pk: task.deadline.timestamp()}
+
+
+@pytest.mark.django_db
+def test_task_update_moves_deadline(
+    redis_client, task_factory, django_capture_on_commit_callbacks
+):
+    task = task_factory()
+    task.deadline = timezone.now() + timedelta(days=3)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        task.save()
+
+    assert scheduled(redis_client) == {task.pk: task.deadline.timestamp()}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("status", [Task.TaskStatus.CANCELED, Task.TaskStatus.EXPIRED])
+def test_task_final_status_unschedules_deadline(
+    redis_client, task_factory, status, django_capture_on_commit_callbacks
+):
+    task = task_factory()
+    task.status = status
+
+    with django_capture_on_commit_callbacks(execute=True):
+        task.save()
+
+    redis_client.zadd.assert_not_called()
+    redis_client.zrem.assert_called_once_with(deadlines.DEADLINES_KEY, task.pk)
+
+
+@pytest.mark.django_db
+def test_task_reject_after_deadline_schedules_it_again(
+    redis_client, task_factory, freelancer_user, django_capture_on_commit_callbacks
+):
+    # dropped from the set when it came due while pending review
+    task = task_factory(
+        deadline=timezone.now() - timedelta(minutes=1),
+        freelancer=freelancer_user,
+        status=Task.TaskStatus.PENDING_REVIEW,
+    )
+    redis_client.reset_mock()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        services.reject_task_submission(task)
+
+    assert scheduled(redis_client) == {task.pk: task.deadline.timestamp()}
+
+
+@pytest.mark.django_db
+def test_task_transition_to_pending_review_unschedules_deadline(
+    redis_client, task_factory, freelancer_user, django_capture_on_commit_callbacks
+):
+    task = task_factory(freelancer=freelancer_user, status=Task.TaskStatus.IN_PROGRESS)
+    redis_client.reset_mock()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        apply_transition(task, task.begin_review)
+
+    redis_client.zadd.assert_not_called()
+    redis_client.zrem.assert_called_once_with(deadlines.DEADLINES_KEY, task.pk)
+
+
+@pytest.mark.django_db
+def test_task_delete_unschedules_deadline(
+    redis_client, task_factory, django_capture_on_commit_callbacks
+):
+    task = task_factory()
+    task_id = task.pk
+
+    with django_capture_on_commit_callbacks(execute=True):
+        task.delete()
+
+    redis_client.zrem.assert_called_once_with(deadlines.DEADLINES_KEY, task_id)
+
+
+@pytest.mark.django_db
+def test_task_save_survives_redis_errors(
+    redis_client, task_factory, django_capture_on_commit_callbacks, caplog
+):
+    redis_client.zadd.side_effect = redis.ConnectionError
+
+    with django_capture_on_commit_callbacks(execute=True):
+        task = task_factory()
+
+    assert Task.objects.filter(pk=task.pk).exists()
+    assert f"deadline of task #{task.pk}" in caplog.text
+
+
+def test_due(redis_client):
+    redis_client.zrangebyscore.return_value = [b"3", b"1"]
+    now = timezone.now()
+
+    assert deadlines.due(now, 100) == [3, 1]
+    redis_client.zrangebyscore.assert_called_once_with(
+        deadlines.DEADLINES_KEY, "-inf", now.timestamp(), start=0, num=100
+    )
+
+
+@pytest.mark.django_db
+def test_expire_due_tasks(redis_client, task_factory):
+    yesterday = timezone.now() - timedelta(days=1)
+    overdue = task_factory(deadline=yesterday, status=Task.TaskStatus.IN_PROGRESS)
+    # moved to a later deadline after it was read from the set
+    moved = task_factory(deadline=timezone.now() + timedelta(days=1))
+    # overdue, but not due according to the set: left to the hourly sweep
+    missed = task_factory(deadline=yesterday)
+    redis_client.zrangebyscore.return_value = [
+        str(task.pk).encode() for task in (overdue, moved)
+    ]
+
+    expire_due_tasks()
+
+    overdue.refresh_from_db()
+    moved.refresh_from_db()
+    missed.refresh_from_db()
+    assert overdue.status == Task.TaskStatus.EXPIRED
+    assert moved.status == Task.TaskStatus.OPEN
+    assert missed.status == Task.TaskStatus.OPEN
+    redis_client.zrem.assert_called_once_with(
+        deadlines.DEADLINES_KEY, overdue.pk, moved.pk
+    )
+    assert scheduled(redis_client) == {moved.pk: moved.deadline.timestamp()}
+
+
+@pytest.mark.django_db
+def test_expire_due_tasks_nothing_due(redis_client, django_assert_num_queries):
+    redis_client.zrangebyscore.return_value = []
+
+    with django_assert_num_queries(0):
+        expire_due_tasks()
+
+
+@pytest.mark.django_db
+def test_rebuild_task_deadlines(redis_client, task_factory):
+    open_task = task_factory()
+    paid_task = task_factory(status=Task.TaskStatus.PAID)
+    task_factory(status=Task.TaskStatus.COMPLETED)
+    open_task.refresh_from_db()
+    paid_task.refresh_from_db()
+    redis_client.reset_mock()
+
+    call_command("rebuild_task_deadlines")
+
+    assert scheduled(redis_client) == {
+        open_task.pk: open_task.deadline.timestamp(),
+        paid_task.pk: paid_task.deadline.timestamp(),
+    }
+    # merged into the live set, which may have been scheduled meanwhile
+    redis_client.pipeline.return_value.zunionstore.assert_called_once_with(
+        deadlines.DEADLINES_KEY,
+        [deadlines.DEADLINES_KEY, f"{deadlines.DEADLINES_KEY}:rebuild"],
+        "MIN",
+    )
+    redis_client.rename.assert_not_called()
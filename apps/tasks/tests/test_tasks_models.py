@@ -7,6 +7,17 @@ from apps.tasks.models import Task
 User = get_user_model()
 
 
+@pytest.mark.django_db
+def test_tasks_are_loaded_without_search_vector(task_factory, freelancer_user):
+    task = task_factory()
+    task_factory(freelancer=freelancer_user)
+
+    assert "search_vector" in Task.objects.get(pk=task.pk).get_deferred_fields()
+    assert (
+        "search_vector" in freelancer_user.freelancer_tasks.get().get_deferred_fields()
+    )
+
+
 # start
 
 
@@ -1,52 +1,54 @@
 from unittest.mock import patch
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_fsm import TransitionNotAllowed
 
 from apps.tasks import services
 from apps.tasks.models import Task
+from apps.tasks.transitions import TransitionConflict, apply_transition
 
 
 @pytest.mark.django_db
-@patch("apps.tasks.services.send_email_notification.delay")
-def test_start_task(mock_send_email_notification, task_factory, freelancer_user):
+@patch("apps.tasks.services.outbox.publish")
+def test_start_task(mock_publish, task_factory, freelancer_user):
     task = task_factory(freelancer=freelancer_user, status=Task.TaskStatus.PAID)
 
     services.start_task(task)
 
     task.refresh_from_db()
     assert task.status == Task.TaskStatus.IN_PROGRESS
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
 
 
 @pytest.mark.django_db
-@patch("apps.tasks.services.send_email_notification.delay")
-def test_pay_task(mock_send_email_notification, task_factory, freelancer_user):
+@patch("apps.tasks.services.outbox.publish")
+def test_pay_task(mock_publish, task_factory, freelancer_user):
     task = task_factory(freelancer=freelancer_user)
 
     services.pay_task(task)
 
     task.refresh_from_db()
     assert task.status == Task.TaskStatus.PAID
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
 
 
 @pytest.mark.django_db
-@patch("apps.tasks.services.send_email_notification.delay")
-def test_submit_task(mock_send_email_notification, task_factory, freelancer_user):
+@patch("apps.tasks.services.outbox.publish")
+def test_submit_task(mock_publish, task_factory, freelancer_user):
     task = task_factory(status=Task.TaskStatus.IN_PROGRESS, freelancer=freelancer_user)
 
     services.submit_task(task)
 
     task.refresh_from_db()
     assert task.status == Task.TaskStatus.PENDING_REVIEW
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
 
 
 @pytest.mark.django_db
-@patch("apps.tasks.services.send_email_notification.delay")
-def test_approve_task_submission(
-    mock_send_email_notification, task_factory, freelancer_user
-):
+@patch("apps.tasks.services.outbox.publish")
+def test_approve_task_submission(mock_publish, task_factory, freelancer_user):
     task = task_factory(
         status=Task.TaskStatus.PENDING_REVIEW, freelancer=freelancer_user
     )
@@ -55,14 +57,12 @@ def test_approve_task_submission(
 
     task.refresh_from_db()
     assert task.status == Task.TaskStatus.COMPLETED
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
 
 
 @pytest.mark.django_db
-@patch("apps.tasks.services.send_email_notification.delay")
-def test_reject_task_submission(
-    mock_send_email_notification, task_factory, freelancer_user
-):
+@patch("apps.tasks.services.outbox.publish")
+def test_reject_task_submission(mock_publish, task_factory, freelancer_user):
     task = task_factory(
         status=Task.TaskStatus.PENDING_REVIEW, freelancer=freelancer_user
     )
@@ -71,32 +71,66 @@ def test_reject_task_submission(
 
     task.refresh_from_db()
     assert task.status == Task.TaskStatus.IN_PROGRESS
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
 
 
 @pytest.mark.django_db
-@patch("apps.tasks.services.send_email_notification.delay")
-def test_cancel_task_as_client(
-    mock_send_email_notification, task_factory, freelancer_user
-):
+@patch("apps.tasks.services.outbox.publish")
+def test_cancel_task_as_client(mock_publish, task_factory, freelancer_user):
     task = task_factory(freelancer=freelancer_user)
 
     services.cancel_task(task, task.client)
 
     task.refresh_from_db()
     assert task.status == Task.TaskStatus.CANCELED
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
 
 
 @pytest.mark.django_db
-@patch("apps.tasks.services.send_email_notification.delay")
-def test_cancel_task_as_freelancer(
-    mock_send_email_notification, task_factory, freelancer_user
-):
+@patch("apps.tasks.services.outbox.publish")
+def test_cancel_task_as_freelancer(mock_publish, task_factory, freelancer_user):
     task = task_factory(freelancer=freelancer_user)
 
     services.cancel_task(task, task.freelancer)
 
     task.refresh_from_db()
     assert task.status == Task.TaskStatus.CANCELED
-    mock_send_email_notification.assert_called_once()
+    mock_publish.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch("apps.tasks.services.outbox.publish")
+def test_start_task_is_a_single_update(mock_publish, task_factory, freelancer_user):
+    task = task_factory(freelancer=freelancer_user, status=Task.TaskStatus.PAID)
+
+    with CaptureQueriesContext(connection) as captured:
+        services.start_task(task)
+
+    task_queries = [q["sql"] for q in captured if '"tasks_task"' in q["sql"]]
+    assert len(task_queries) == 1
+    assert task_queries[0].startswith("UPDATE")
+    assert '"status" IN' in task_queries[0]
+    assert task.status == Task.TaskStatus.IN_PROGRESS
+
+
+@pytest.mark.django_db
+@patch("apps.tasks.services.outbox.publish")
+def test_start_task_conflict(mock_publish, task_factory, freelancer_user):
+    task = task_factory(freelancer=freelancer_user, status=Task.TaskStatus.PAID)
+    Task.objects.filter(pk=task.pk).update(status=Task.TaskStatus.EXPIRED)
+
+    with pytest.raises(TransitionConflict):
+        services.start_task(task)
+
+    assert task.status == Task.TaskStatus.PAID
+    task.refresh_from_db()
+    assert task.status == Task.TaskStatus.EXPIRED
+    mock_publish.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_apply_transition_not_allowed(task_factory):
+    task = task_factory(status=Task.TaskStatus.COMPLETED)
+
+    with pytest.raises(TransitionNotAllowed):
+        apply_transition(task, task.cancel)
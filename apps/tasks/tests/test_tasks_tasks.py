@@ -1,9 +1,12 @@
 from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 from django.utils import timezone
 
+from apps.tasks import counters
 from apps.tasks.models import Task
+from apps.tasks.signals import task_expired
 from apps.tasks.tasks import expire_tasks
 
 
@@ -29,3 +32,54 @@ def test_expire_tasks_expires_open_and_in_progress_tasks(task_factory):
     for task in expired_tasks:
         assert task.deadline < timezone.now()
         assert task.status == Task.TaskStatus.EXPIRED
+
+
+@pytest.mark.django_db
+@patch("apps.tasks.tasks.EXPIRE_BATCH_SIZE", 2)
+def test_expire_tasks_processes_all_batches(task_factory):
+    yesterday = timezone.now() - timedelta(days=1)
+    for _ in range(5):
+        task_factory(deadline=yesterday, status=Task.TaskStatus.PAID)
+
+    expire_tasks()
+
+    assert not Task.objects.exclude(status=Task.TaskStatus.EXPIRED).exists()
+
+
+@pytest.mark.django_db
+@patch("apps.tasks.tasks.EXPIRE_BATCH_SIZE", 2)
+def test_expire_tasks_updates_status_counters(task_factory, client_user):
+    yesterday = timezone.now() - timedelta(days=1)
+    task_factory(deadline=yesterday, status=Task.TaskStatus.OPEN)
+    task_factory(deadline=yesterday, status=Task.TaskStatus.OPEN)
+    task_factory(deadline=yesterday, status=Task.TaskStatus.PAID)
+
+    expire_tasks()
+
+    assert counters.get_counts()[Task.TaskStatus.OPEN] == 0
+    assert counters.get_counts()[Task.TaskStatus.PAID] == 0
+    assert counters.get_counts()[Task.TaskStatus.EXPIRED] == 3
+    assert counters.get_counts(client_user.pk)[Task.TaskStatus.EXPIRED] == 3
+
+
+@pytest.mark.django_db
+def test_expire_tasks_sends_task_expired_signal(task_factory):
+    yesterday = timezone.now() - timedelta(days=1)
+    open_task = task_factory(deadline=yesterday, status=Task.TaskStatus.OPEN)
+    paid_task = task_factory(deadline=yesterday, status=Task.TaskStatus.PAID)
+    receiver = MagicMock()
+    task_expired.connect(receiver)
+
+    try:
+        expire_tasks()
+    finally:
+        task_expired.disconnect(receiver)
+
+    calls = {
+        call.kwargs["task_id"]: call.kwargs["source"]
+        for call in receiver.call_args_list
+    }
+    assert calls == {
+        open_task.pk: Task.TaskStatus.OPEN,
+        paid_task.pk: Task.TaskStatus.PAID,
+    }
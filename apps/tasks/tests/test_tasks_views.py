@@ -1,11 +1,23 @@
+import csv
+import io
+import json
 from unittest.mock import patch
 
 import pytest
+import redis
 from django.contrib.auth import get_user_model
+from django.core.cache import cache as django_cache
+from django.db.models.functions import Left
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 
 from apps.tasks.models import Task
+from apps.tasks.serializers import (
+    LIST_DESCRIPTION_LENGTH,
+    TaskListSerializer,
+    TaskSerializer,
+)
 
 User = get_user_model()
 
@@ -103,6 +115,33 @@ def test_task_list_search_by_description(api_client, client_user, tasks):
     )
 
 
+@pytest.mark.django_db
+def test_task_list_search_matches_word_forms(api_client, task_factory):
+    task = task_factory(title="Design logos", description="Vector artwork needed")
+    task_factory(title="Write copy", description="Landing page text")
+
+    response = api_client.get(reverse("tasks:task-list"), {"search": "logo designer"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [task_data["id"] for task_data in response.data.get("results")] == [task.pk]
+
+
+@pytest.mark.django_db
+def test_task_list_search_ranks_title_matches_first(api_client, task_factory):
+    title_match = task_factory(title="Python script", description="Automate reports")
+    description_match = task_factory(
+        title="Automation", description="Small python script for reports"
+    )
+
+    response = api_client.get(reverse("tasks:task-list"), {"search": "python"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [task_data["id"] for task_data in response.data.get("results")] == [
+        title_match.pk,
+        description_match.pk,
+    ]
+
+
 @pytest.mark.django_db
 def test_task_list_order_by_price_desc(api_client, client_user, tasks):
     api_client.force_authenticate(client_user)
@@ -123,6 +162,364 @@ def test_task_list_order_by_deadline_asc(api_client, client_user, tasks):
     assert deadlines == sorted(deadlines)
 
 
+@pytest.mark.django_db
+def test_task_list_cursor_pagination_walks_all_pages(api_client, tasks):
+    response = api_client.get(
+        reverse("tasks:task-list"), {"pagination": "cursor", "limit": 3}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "count" not in response.data
+    assert response.data.get("previous") is None
+
+    ids = [task_data["id"] for task_data in response.data.get("results")]
+    while response.data.get("next"):
+        response = api_client.get(response.data.get("next"))
+        assert response.status_code == status.HTTP_200_OK
+        ids += [task_data["id"] for task_data in response.data.get("results")]
+
+    expected = [task.pk for task in sorted(tasks, key=lambda t: t.created_at)][::-1]
+    assert ids == expected
+
+
+@pytest.mark.django_db
+def test_task_list_cursor_pagination_ties_are_stable(api_client, task_factory):
+    tasks = [task_factory(price=100.00) for _ in range(5)]
+    response = api_client.get(
+        reverse("tasks:task-list"),
+        {"pagination": "cursor", "limit": 2, "ordering": "price"},
+    )
+
+    ids = [task_data["id"] for task_data in response.data.get("results")]
+    while response.data.get("next"):
+        response = api_client.get(response.data.get("next"))
+        ids += [task_data["id"] for task_data in response.data.get("results")]
+
+    assert ids == sorted(task.pk for task in tasks)
+
+
+@pytest.mark.django_db
+def test_task_list_cursor_pagination_previous_page(api_client, tasks):
+    first_page = api_client.get(
+        reverse("tasks:task-list"),
+        {"pagination": "cursor", "limit": 3, "ordering": "-price"},
+    )
+    second_page = api_client.get(first_page.data.get("next"))
+    response = api_client.get(second_page.data.get("previous"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data.get("results") == first_page.data.get("results")
+
+
+@pytest.mark.django_db
+def test_task_list_cursor_pagination_invalid_cursor(api_client, tasks):
+    response = api_client.get(reverse("tasks:task-list"), {"cursor": "invalid"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_task_list_unauthenticated_is_cached(
+    api_client, tasks, django_assert_num_queries
+):
+    first = api_client.get(reverse("tasks:task-list"), {"status": "open", "x": "1"})
+
+    with django_assert_num_queries(0):
+        response = api_client.get(reverse("tasks:task-list"), {"status": "open"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == first.data
+
+
+@pytest.mark.django_db
+def test_task_list_cache_is_invalidated_on_task_change(
+    api_client, tasks, django_capture_on_commit_callbacks
+):
+    before = api_client.get(reverse("tasks:task-list"), {"status": "open"})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        tasks[0].cancel()
+        tasks[0].save()
+    response = api_client.get(reverse("tasks:task-list"), {"status": "open"})
+
+    assert response.data.get("count") == before.data.get("count") - 1
+
+
+@pytest.mark.django_db
+def test_task_list_unauthenticated_without_cache(api_client, tasks):
+    with patch.object(django_cache, "get", side_effect=redis.ConnectionError):
+        response = api_client.get(reverse("tasks:task-list"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == len(tasks)
+
+
+@pytest.mark.django_db
+def test_task_update_survives_cache_errors(
+    api_client, client_user, task_factory, django_capture_on_commit_callbacks
+):
+    task = task_factory()
+    api_client.force_authenticate(client_user)
+
+    with (
+        patch.object(django_cache, "incr", side_effect=redis.ConnectionError),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        response = api_client.patch(
+            reverse("tasks:task-detail", args=[task.pk]), {"title": "UPDATED"}
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_task_list_authenticated_is_not_cached(
+    api_client, client_user, tasks, django_assert_num_queries
+):
+    api_client.force_authenticate(client_user)
+    api_client.get(reverse("tasks:task-list"))
+
+    with django_assert_num_queries(2):
+        api_client.get(reverse("tasks:task-list"))
+
+
+@pytest.mark.django_db
+def test_task_list_matches_serializer(api_client, tasks):
+    queryset = Task.objects.annotate(
+        description_snippet=Left("description", LIST_DESCRIPTION_LENGTH)
+    )
+    expected = TaskListSerializer(queryset.order_by("-created_at"), many=True).data
+
+    # rows are represented straight from the database values
+    with patch.object(TaskListSerializer, "to_representation") as to_representation:
+        response = api_client.get(reverse("tasks:task-list"))
+
+    to_representation.assert_not_called()
+    assert JSONRenderer().render(response.data["results"]) == JSONRenderer().render(
+        expected
+    )
+
+
+@pytest.mark.django_db
+def test_task_list_fields(api_client, tasks):
+    response = api_client.get(reverse("tasks:task-list"), {"fields": "id,title"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert all(set(task) == {"id", "title"} for task in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_task_list_omit(api_client, tasks):
+    response = api_client.get(reverse("tasks:task-list"), {"omit": "description"})
+
+    assert response.status_code == status.HTTP_200_OK
+    expected = set(TaskSerializer.Meta.fields) - {"description"}
+    assert all(set(task) == expected for task in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_task_list_unknown_field(api_client, tasks):
+    response = api_client.get(reverse("tasks:task-list"), {"fields": "id,secret"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "fields" in response.data
+
+
+@pytest.mark.django_db
+def test_task_list_fields_are_part_of_cache_key(api_client, tasks):
+    api_client.get(reverse("tasks:task-list"), {"fields": "id"})
+    response = api_client.get(reverse("tasks:task-list"), {"fields": "title"})
+
+    assert set(response.data["results"][0]) == {"title"}
+
+
+@pytest.mark.django_db
+def test_task_list_description_is_truncated(
+    api_client, task_factory, django_assert_num_queries
+):
+    task = task_factory(description="word " * 200)
+
+    with django_assert_num_queries(2) as queries:
+        response = api_client.get(reverse("tasks:task-list"))
+
+    assert response.data["results"][0]["description"] == task.description[:300]
+    # only the snippet is read from the database
+    sql = queries.captured_queries[-1]["sql"]
+    assert 'LEFT("tasks_task"."description", 300)' in sql
+    assert sql.count('"tasks_task"."description"') == 1
+
+
+@pytest.mark.django_db
+def test_task_list_expand_users(
+    api_client, client_user, freelancer_user, task_factory, django_assert_num_queries
+):
+    task_factory(freelancer=freelancer_user)
+    task_factory()
+
+    with django_assert_num_queries(2):
+        response = api_client.get(
+            reverse("tasks:task-list"), {"expand": "client,freelancer"}
+        )
+
+    assigned, unassigned = sorted(
+        response.data["results"], key=lambda task: task["freelancer"] is None
+    )
+    assert assigned["client"]["email"] == client_user.email
+    assert assigned["freelancer"]["id"] == freelancer_user.pk
+    assert "password" not in assigned["freelancer"]
+    assert unassigned["freelancer"] is None
+
+
+@pytest.mark.django_db
+def test_task_list_expand_is_not_cached(api_client, client_user, task_factory):
+    task_factory()
+    api_client.get(reverse("tasks:task-list"), {"expand": "client"})
+
+    client_user.first_name = "Changed"
+    client_user.save()
+    response = api_client.get(reverse("tasks:task-list"), {"expand": "client"})
+
+    assert response.data["results"][0]["client"]["first_name"] == "Changed"
+
+
+@pytest.mark.django_db
+def test_task_list_expand_unknown_field(api_client, tasks):
+    response = api_client.get(reverse("tasks:task-list"), {"expand": "client,title"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "expand" in response.data
+
+
+@pytest.mark.django_db
+def test_task_retrieve_expand_client(api_client, client_user, task_factory):
+    task = task_factory()
+    api_client.force_authenticate(client_user)
+
+    response = api_client.get(
+        reverse("tasks:task-detail", kwargs={"pk": task.pk}), {"expand": "client"}
+    )
+
+    assert response.data["client"]["id"] == client_user.pk
+    assert response.data["freelancer"] is None
+
+
+@pytest.mark.django_db
+def test_task_update_ignores_expand(api_client, client_user, task_factory):
+    task = task_factory()
+    api_client.force_authenticate(client_user)
+
+    response = api_client.patch(
+        reverse("tasks:task-detail", kwargs={"pk": task.pk}) + "?expand=client",
+        {"title": "Patched"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["client"] == client_user.pk
+
+
+@pytest.mark.django_db
+def test_task_retrieve_description_is_not_truncated(
+    api_client, client_user, task_factory
+):
+    task = task_factory(description="word " * 200)
+    api_client.force_authenticate(client_user)
+
+    response = api_client.get(reverse("tasks:task-detail", kwargs={"pk": task.pk}))
+
+    assert response.data["description"] == task.description
+
+
+# stats
+
+
+@pytest.mark.django_db
+def test_task_stats_unauthenticated(api_client, tasks):
+    response = api_client.get(reverse("tasks:task-stats"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sum(response.data["total"].values()) == len(tasks)
+    assert (
+        response.data["total"][Task.TaskStatus.OPEN]
+        == Task.objects.filter(status=Task.TaskStatus.OPEN).count()
+    )
+    assert response.data["client"] is None
+
+
+@pytest.mark.django_db
+def test_task_stats_of_authenticated_client(
+    api_client, client_user, random_user, task_factory
+):
+    task_factory()
+    task_factory(client=random_user)
+    api_client.force_authenticate(client_user)
+
+    response = api_client.get(reverse("tasks:task-stats"))
+
+    assert response.data["total"][Task.TaskStatus.OPEN] == 2
+    assert response.data["client"][Task.TaskStatus.OPEN] == 1
+    assert response.data["client"][Task.TaskStatus.COMPLETED] == 0
+
+
+@pytest.mark.django_db
+def test_task_stats_of_given_client(api_client, random_user, task_factory):
+    task_factory(client=random_user, status=Task.TaskStatus.PAID)
+
+    response = api_client.get(reverse("tasks:task-stats"), {"client": random_user.pk})
+
+    assert response.data["client"][Task.TaskStatus.PAID] == 1
+
+
+@pytest.mark.django_db
+def test_task_stats_invalid_client(api_client):
+    response = api_client.get(reverse("tasks:task-stats"), {"client": "abc"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# export
+
+
+@pytest.mark.django_db
+def test_task_export_unauthenticated(api_client, tasks):
+    response = api_client.get(reverse("tasks:task-export"))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+
+
+@pytest.mark.django_db
+def test_task_export_ndjson(api_client, client_user, tasks):
+    api_client.force_authenticate(client_user)
+    response = api_client.get(reverse("tasks:task-export"), {"status": "open"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert 'filename="tasks.ndjson"' in response["Content-Disposition"]
+    rows = [
+        json.loads(line) for line in b"".join(response.streaming_content).splitlines()
+    ]
+    open_tasks = Task.objects.filter(status=Task.TaskStatus.OPEN)
+    assert [row["id"] for row in rows] == list(open_tasks.values_list("id", flat=True))
+    assert rows[0] == TaskSerializer(open_tasks[0]).data
+
+
+@pytest.mark.django_db
+def test_task_export_csv(api_client, client_user, tasks):
+    api_client.force_authenticate(client_user)
+    response = api_client.get(
+        reverse("tasks:task-export"), {"format": "csv", "ordering": "price"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert len(rows) == len(tasks)
+    assert [row["id"] for row in rows] == [
+        str(pk) for pk in Task.objects.order_by("price").values_list("id", flat=True)
+    ]
+
+
 # create
 
 
@@ -204,6 +601,84 @@ def test_task_retrieve_success(api_client, client_user, task_factory):
     assert response.data.get("id") == task.pk
 
 
+@pytest.mark.django_db
+def test_task_retrieve_not_modified(
+    api_client, client_user, task_factory, django_assert_num_queries
+):
+    task = task_factory()
+    api_client.force_authenticate(client_user)
+    url = reverse("tasks:task-detail", args=[task.pk])
+    etag = api_client.get(url).headers["ETag"]
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_task_retrieve_modified_after_change(api_client, client_user, task_factory):
+    task = task_factory()
+    api_client.force_authenticate(client_user)
+    url = reverse("tasks:task-detail", args=[task.pk])
+    etag = api_client.get(url).headers["ETag"]
+
+    task.title = "Changed"
+    task.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.data.get("title") == "Changed"
+
+
+@pytest.mark.django_db
+def test_task_retrieve_expanded_modified_after_relation_change(
+    api_client, client_user, freelancer_user, task_factory
+):
+    task = task_factory(freelancer=freelancer_user)
+    api_client.force_authenticate(client_user)
+    url = reverse("tasks:task-detail", args=[task.pk]) + "?expand=client,freelancer"
+    etag = api_client.get(url).headers["ETag"]
+
+    freelancer_user.first_name = "Changed"
+    freelancer_user.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.data["freelancer"]["first_name"] == "Changed"
+
+
+@pytest.mark.django_db
+def test_task_retrieve_expanded_not_modified_without_freelancer(
+    api_client, client_user, task_factory, django_assert_num_queries
+):
+    task = task_factory()
+    api_client.force_authenticate(client_user)
+    url = reverse("tasks:task-detail", args=[task.pk]) + "?expand=freelancer"
+    etag = api_client.get(url).headers["ETag"]
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_task_retrieve_if_modified_since(api_client, client_user, task_factory):
+    task = task_factory()
+    api_client.force_authenticate(client_user)
+    url = reverse("tasks:task-detail", args=[task.pk])
+    last_modified = api_client.get(url).headers["Last-Modified"]
+
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
 # update
 
 
@@ -569,7 +1044,39 @@ def test_task_pay_success(
 
     assert response.status_code == status.HTTP_200_OK
     assert response.data.get("checkout_url") == "http://checkout.url"
-    mock_create_checkout_session.assert_called_once_with(task)
+    mock_create_checkout_session.assert_called_once_with(task, idempotency_key=None)
+
+
+@pytest.mark.django_db
+@patch(
+    "apps.tasks.views.StripeService.create_checkout_session",
+    return_value="http://checkout.url",
+)
+def test_task_pay_passes_idempotency_key(
+    mock_create_checkout_session, api_client, client_user, freelancer_user, task_factory
+):
+    task = task_factory(freelancer=freelancer_user)
+    api_client.force_authenticate(client_user)
+    api_client.post(
+        reverse("tasks:task-pay", args=[task.pk]), HTTP_IDEMPOTENCY_KEY="key"
+    )
+
+    mock_create_checkout_session.assert_called_once_with(task, idempotency_key="key")
+
+
+@pytest.mark.django_db
+@patch(
+    "apps.tasks.views.StripeService.create_checkout_session",
+    return_value="http://checkout.url",
+)
+def test_task_pay_ignores_blank_idempotency_key(
+    mock_create_checkout_session, api_client, client_user, freelancer_user, task_factory
+):
+    task = task_factory(freelancer=freelancer_user)
+    api_client.force_authenticate(client_user)
+    api_client.post(reverse("tasks:task-pay", args=[task.pk]), HTTP_IDEMPOTENCY_KEY="")
+
+    mock_create_checkout_session.assert_called_once_with(task, idempotency_key=None)
 
 
 @pytest.mark.django_db
@@ -611,4 +1118,4 @@ def test_task_pay_create_checkout_session_fails(
     response = api_client.post(reverse("tasks:task-pay", args=[task.pk]))
 
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-    mock_create_checkout_session.assert_called_once_with(task)
+    mock_create_checkout_session.assert_called_once_with(task, idempotency_key=None)
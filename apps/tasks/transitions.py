@@ -0,0 +1,67 @@
+from django.utils import timezone
+from django_fsm import TransitionNotAllowed
+from django_fsm.signals import post_transition
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import Task
+
+
+class TransitionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The task has been changed by another request, try again."
+    default_code = "transition_conflict"
+
+
+def apply_transition(task: Task, transition) -> bool:
+    """
+    Runs `transition`, a bound `Task` transition method such as `task.start`,
+    as a single conditional UPDATE of the status and `updated_at` columns
+    guarded by the transition's source states.
+
+    The transition is validated against the loaded task like django_fsm does,
+    but the database decides: if the row has left the source states since it
+    was loaded, nothing is written, `task` is left as is and False is returned.
+    On success `task` is updated in place and `post_transition` is sent.
+    """
+
+    meta = transition._django_fsm
+    source = task.status
+    if not meta.has_transition(source) or not meta.conditions_met(task, source):
+        raise TransitionNotAllowed(
+            f"Can't switch from state '{source}' using method "
+            f"'{transition.__name__}'",
+            object=task,
+            method=transition,
+        )
+
+    target = meta.next_state(source)
+    meta.get_transition(source).method(task)
+
+    now = timezone.now()
+    updated = Task.objects.filter(pk=task.pk, status__in=list(meta.transitions)).update(
+        status=target, updated_at=now
+    )
+    if not updated:
+        return False
+
+    task.status = target
+    task.updated_at = now
+    post_transition.send(
+        sender=Task,
+        instance=task,
+        name=transition.__name__,
+        field=meta.field,
+        source=source,
+        target=target,
+        method_args=(),
+        method_kwargs={},
+    )
+    return True
+
+
+def transition_or_conflict(task: Task, transition) -> None:
+    """Like `apply_transition`, but raises `TransitionConflict` on a conflict."""
+
+    if not apply_transition(task, transition):
+        raise TransitionConflict()
@@ -1,7 +1,10 @@
 import logging
 
+from django.db import transaction
+from django.db.models.functions import Left
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import (
+    OpenApiParameter,
     OpenApiResponse,
     extend_schema,
     extend_schema_view,
@@ -9,14 +12,25 @@ from drf_spectacular.utils import (
 )
 from rest_framework import filters, serializers, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from apps.core import outbox
+from apps.core.export import EXPORT_RENDERERS, ExportMixin
+from apps.core.pagination import KeysetPagination
 from apps.core.tasks import send_email_notification
+from apps.core.views import (
+    ConditionalRetrieveMixin,
+    ExpandRelatedMixin,
+    ReplicaReadMixin,
+    ValuesListMixin,
+)
 from apps.payments.services import StripeService
 from apps.users.permissions import IsClient
 
-from . import services
+from . import cache, counters, services
+from .filters import TaskFullTextSearchFilter
 from .models import Task
 from .permissions import (
     IsClientOfTask,
@@ -27,7 +41,7 @@ from .permissions import (
     IsTaskPaid,
     IsTaskPendingReview,
 )
-from .serializers import TaskSerializer
+from .serializers import LIST_DESCRIPTION_LENGTH, TaskListSerializer, TaskSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +50,20 @@ logger = logging.getLogger(__name__)
 @extend_schema_view(
     list=extend_schema(
         summary="List all tasks",
-        description="Retrieves a list of all tasks. Accessible by all users.",
+        description="Retrieves a list of all tasks. Accessible by all users. "
+        "Pass `pagination=cursor` to switch to keyset pagination, which follows "
+        "`next`/`previous` cursors instead of offsets and skips the total count. "
+        "Anonymous responses are cached until a task changes, unless they "
+        "expand users. Descriptions are cut to their first 300 characters, "
+        "pick fields with `fields=a,b` or leave some out with `omit=c`. "
+        "`expand=client,freelancer` inlines the public profiles of the users "
+        "instead of their ids.",
     ),
     retrieve=extend_schema(
         summary="Retrieve a task",
         description="Retrieves the details of a specific task. Accessible by "
-        "authenticated users.",
+        "authenticated users. Supports conditional requests with `If-None-Match` "
+        "and `If-Modified-Since`.",
     ),
     create=extend_schema(
         summary="Create a new task",
@@ -63,22 +85,47 @@ logger = logging.getLogger(__name__)
         "it, and only if the task is open.",
     ),
 )
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(
+    ReplicaReadMixin,
+    ConditionalRetrieveMixin,
+    ExpandRelatedMixin,
+    ExportMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        TaskFullTextSearchFilter,
         filters.OrderingFilter,
     ]
     filterset_fields = ["status", "client", "freelancer"]
     search_fields = ["title", "description"]
     ordering_fields = ["created_at", "updated_at", "price", "deadline"]
+    export_fields = list(TaskSerializer.Meta.fields)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            # lists carry a snippet of the description, the full text is only
+            # read by the database
+            queryset = queryset.defer("description")
+            if "description" in self.get_serializer().fields:
+                queryset = queryset.annotate(
+                    description_snippet=Left("description", LIST_DESCRIPTION_LENGTH)
+                )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return TaskListSerializer
+        return super().get_serializer_class()
 
     def get_permissions(self):
         permissions = [IsAuthenticated]
         # default actions
-        if self.action == "list":
+        if self.action in ["list", "stats"]:
             permissions = [AllowAny]
         elif self.action == "create":
             permissions += [IsClient]
@@ -98,13 +145,54 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         return [permission() for permission in permissions]
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.action == "list":
+            if KeysetPagination.is_requested(self.request):
+                self._paginator = KeysetPagination()
+        return super().paginator
+
+    @property
+    def list_cache_params(self) -> list[str]:
+        """Query parameters that select a list response."""
+
+        return [
+            *self.filterset_fields,
+            TaskFullTextSearchFilter.search_param,
+            filters.OrderingFilter.ordering_param,
+            LimitOffsetPagination.limit_query_param,
+            LimitOffsetPagination.offset_query_param,
+            KeysetPagination.cursor_query_param,
+            KeysetPagination.mode_query_param,
+            TaskSerializer.fields_query_param,
+            TaskSerializer.omit_query_param,
+        ]
+
+    def list(self, request, *args, **kwargs):
+        # expanded users change without any task changing, such responses
+        # would outlive the profiles they embed
+        if request.user.is_authenticated or (
+            self.get_serializer_class().requested_expansions(request)
+        ):
+            return super().list(request, *args, **kwargs)
+
+        # the anonymous feed is the same for everyone, serve it from the cache
+        data = cache.get_or_compute_list(
+            request,
+            self.list_cache_params,
+            lambda: super(TaskViewSet, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(client=self.request.user)
         logger.info(
             f"Task '{serializer.instance.title}' created by user "
             f"{self.request.user.email}."
         )
-        send_email_notification.delay(
+        outbox.publish(
+            send_email_notification,
             subject="Task Created",
             message=f"Task '{serializer.instance.title}' was created.",
             recipient_list=[self.request.user.email],
@@ -175,8 +263,17 @@ class TaskViewSet(viewsets.ModelViewSet):
     @extend_schema(
         summary="Create checkout session",
         description="Creates Stripe checkout session to pay the task. Only task client "
-        "can create.",
+        "can create. An open session of the task is returned instead of creating a "
+        "new one, as is the session created for a repeated `Idempotency-Key`.",
         request=None,
+        parameters=[
+            OpenApiParameter(
+                "Idempotency-Key",
+                str,
+                OpenApiParameter.HEADER,
+                description="Unique key identifying the payment attempt.",
+            )
+        ],
         responses={
             200: OpenApiResponse(
                 description="Checkout session created",
@@ -192,7 +289,57 @@ class TaskViewSet(viewsets.ModelViewSet):
     def pay(self, *args, **kwargs):
         task = self.get_object()
         stripe_service = StripeService()
-        checkout_session_url = stripe_service.create_checkout_session(task)
+        # a blank header is no key, rather than one shared by every request
+        idempotency_key = self.request.headers.get("Idempotency-Key") or None
+        checkout_session_url = stripe_service.create_checkout_session(
+            task, idempotency_key=idempotency_key
+        )
         if checkout_session_url is None:
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         return Response({"checkout_url": checkout_session_url})
+
+    @extend_schema(
+        summary="Export tasks",
+        description="Streams every task matching the list filters, search and "
+        "ordering as NDJSON (default) or CSV, chosen with the `Accept` header or "
+        "`?format=ndjson|csv`. Not paginated. Accessible by authenticated users.",
+        responses={(200, "application/x-ndjson"): bytes, (200, "text/csv"): bytes},
+    )
+    @action(detail=False, methods=["get"], renderer_classes=EXPORT_RENDERERS)
+    def export(self, request, *args, **kwargs):
+        return self.export_response()
+
+    @extend_schema(
+        summary="Task statistics",
+        description="Returns the number of tasks in each status, in total and for "
+        "a client: the one given by the `client` parameter, otherwise the "
+        "authenticated user. Accessible by all users.",
+        parameters=[
+            OpenApiParameter("client", int, description="Client to count tasks of.")
+        ],
+        responses=inline_serializer(
+            name="TaskStats",
+            fields={
+                "total": serializers.DictField(child=serializers.IntegerField()),
+                "client": serializers.DictField(
+                    child=serializers.IntegerField(), allow_null=True
+                ),
+            },
+        ),
+    )
+    @action(detail=False, methods=["get"])
+    def stats(self, request, *args, **kwargs):
+        client_id = request.query_params.get("client")
+        if client_id is not None:
+            client_id = serializers.IntegerField().run_validation(client_id)
+        elif request.user.is_authenticated:
+            client_id = request.user.pk
+
+        return Response(
+            {
+                "total": counters.get_counts(),
+                "client": (
+                    counters.get_counts(client_id) if client_id is not None else None
+                ),
+            }
+        )
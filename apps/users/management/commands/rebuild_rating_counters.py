@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.reviews.models import Review
+from apps.users.models import average_rating_expression
+
+User = get_user_model()
+
+
+def _received(aggregate):
+    return Coalesce(
+        Subquery(
+            Review.objects.filter(recipient=OuterRef("pk"))
+            .values("recipient")
+            .annotate(value=aggregate)
+            .values("value")
+        ),
+        0,
+        output_field=IntegerField(),
+    )
+
+
+def rebuild_batch(start: int, stop: int) -> int:
+    """Recomputes rating counters of users with `start <= pk < stop`."""
+
+    with transaction.atomic():
+        users = User.objects.filter(pk__gte=start, pk__lt=stop)
+        updated = users.update(
+            rating_sum=_received(Sum("rating")),
+            rating_count=_received(Count("pk")),
+        )
+        users.update(
+            average_rating=average_rating_expression(
+                F("rating_sum"), F("rating_count")
+            ),
+            updated_at=timezone.now(),
+        )
+    return updated
+
+
+class Command(BaseCommand):
+    help = "Rebuilds users' rating counters and average rating from their reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of user ids recomputed per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of batches processed in parallel.",
+        )
+
+    def handle(self, *args, batch_size, workers, **options):
+        bounds = User.objects.aggregate(first=Min("pk"), last=Max("pk"))
+        if bounds["first"] is None:
+            self.stdout.write("No users to rebuild.")
+            return
+
+        batches = [
+            (start, start + batch_size)
+            for start in range(bounds["first"], bounds["last"] + 1, batch_size)
+        ]
+
+        if workers == 1:
+            updated = sum(rebuild_batch(*batch) for batch in batches)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                updated = sum(executor.map(self._rebuild_in_thread, batches))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt rating counters of {updated} users.")
+        )
+
+    @staticmethod
+    def _rebuild_in_thread(batch) -> int:
+        try:
+            return rebuild_batch(*batch)
+        finally:
+            # every thread gets its own connection, close it before the thread ends
+            connection.close()
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_user_bio"),
+        ("reviews", "0003_alter_review_comment_alter_review_created_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="rating_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of reviews received by the user."
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="rating_sum",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Sum of all ratings received by the user."
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE users_user AS u
+                SET rating_sum = r.rating_sum, rating_count = r.rating_count
+                FROM (
+                    SELECT recipient_id, SUM(rating) AS rating_sum,
+                           COUNT(*) AS rating_count
+                    FROM reviews_review
+                    GROUP BY recipient_id
+                ) AS r
+                WHERE u.id = r.recipient_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import FloatField
+from django.db.models.functions import Cast, Coalesce, NullIf
 
 from apps.core.models import TimeStampModel
 
@@ -24,6 +26,12 @@ class User(AbstractUser, TimeStampModel):
     average_rating = models.FloatField(
         default=0.0, help_text="Average rating of the user."
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0, help_text="Sum of all ratings received by the user."
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0, help_text="Number of reviews received by the user."
+    )
     bio = models.TextField(blank=True, help_text="A short biography of the user.")
 
     USERNAME_FIELD = "email"
@@ -36,3 +44,13 @@ class User(AbstractUser, TimeStampModel):
 
     def __str__(self) -> str:
         return self.email
+
+
+def average_rating_expression(rating_sum, rating_count):
+    """Derives `average_rating` from the rating counters, 0 when not rated yet."""
+
+    return Coalesce(
+        Cast(rating_sum, FloatField()) / NullIf(rating_count, 0),
+        0.0,
+        output_field=FloatField(),
+    )
@@ -0,0 +1,29 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_rebuild_rating_counters(
+    review_factory, client_user, freelancer_user, random_user
+):
+    review_factory(reviewer=client_user, recipient=freelancer_user, rating=5)
+    review_factory(reviewer=freelancer_user, recipient=client_user, rating=2)
+    User.objects.update(rating_sum=100, rating_count=100, average_rating=1.0)
+
+    call_command("rebuild_rating_counters", batch_size=2, workers=1)
+
+    freelancer_user.refresh_from_db()
+    assert freelancer_user.rating_sum == 5
+    assert freelancer_user.rating_count == 1
+    assert freelancer_user.average_rating == 5.0
+
+    client_user.refresh_from_db()
+    assert client_user.average_rating == 2.0
+
+    random_user.refresh_from_db()
+    assert random_user.rating_sum == 0
+    assert random_user.rating_count == 0
+    assert random_user.average_rating == 0.0
@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
 
+from apps.reviews.models import Review
+
 User = get_user_model()
 
 
@@ -177,6 +179,24 @@ def test_retrieve_user_success(api_client, client_user, freelancer_user):
     assert response.data.get("id") == freelancer_user.pk
 
 
+@pytest.mark.django_db
+def test_retrieve_user_modified_after_review(
+    api_client, client_user, freelancer_user, task_factory
+):
+    api_client.force_authenticate(client_user)
+    url = reverse("users:user-public-detail", args=[freelancer_user.pk])
+    etag = api_client.get(url).headers["ETag"]
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    Review.objects.create(
+        task=task_factory(), reviewer=client_user, recipient=freelancer_user, rating=4
+    )
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data.get("average_rating") == 4
+
+
 # change password
 
 
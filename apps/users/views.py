@@ -7,6 +7,8 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from apps.core.views import ConditionalRetrieveMixin, ReplicaReadMixin
+
 from .serializers import (
     ChangePasswordSerializer,
     MeSerializer,
@@ -49,10 +51,13 @@ class MeView(generics.RetrieveUpdateDestroyAPIView):
 @extend_schema(
     summary="Retrieve public user details",
     description="This endpoint allows anyone to retrieve public details of a "
-    "specific user.",
+    "specific user. Supports conditional requests with `If-None-Match` and "
+    "`If-Modified-Since`.",
     tags=["Users"],
 )
-class UserPublicDetail(generics.RetrieveAPIView):
+class UserPublicDetail(
+    ReplicaReadMixin, ConditionalRetrieveMixin, generics.RetrieveAPIView
+):
     queryset = User.objects.all()
     serializer_class = UserPublicSerializer
 
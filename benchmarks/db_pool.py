@@ -0,0 +1,107 @@
+"""
+Per-request database latency: a new connection per request, as Django does
+with `CONN_MAX_AGE = 0`, vs the psycopg connection pool of `DB_POOL`.
+
+Every simulated request runs Django's request_started / request_finished
+signals around a single query, like a view would. Uses the database of the
+DB_* environment variables:
+
+    python benchmarks/db_pool.py --requests 500 --threads 4 --pool-size 2
+
+With more threads than pooled connections requests queue for a connection,
+which shows up in the pool's wait statistics printed at the end.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def request(alias) -> float:
+    from django.core.signals import request_finished, request_started
+    from django.db import connections
+
+    started = time.perf_counter()
+    request_started.send(sender=None)
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    finally:
+        request_finished.send(sender=None)
+    return time.perf_counter() - started
+
+
+def run(label, alias, requests, threads) -> None:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        latencies = sorted(executor.map(request, [alias] * requests))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<8} {requests / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:6.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DB_NAME", "postgres"),
+        "USER": os.environ.get("DB_USER", "postgres"),
+        "PASSWORD": os.environ.get("DB_PASS", ""),
+        "HOST": os.environ.get("DB_HOST", "localhost"),
+        "PORT": os.environ.get("DB_PORT", "5432"),
+    }
+    settings.configure(
+        DATABASES={
+            "default": database,
+            "direct": database,
+            "pooled": {
+                **database,
+                "CONN_HEALTH_CHECKS": True,
+                "OPTIONS": {
+                    "pool": {"min_size": args.pool_size, "max_size": args.pool_size}
+                },
+            },
+        }
+    )
+    django.setup()
+
+    from django.db import connections
+
+    from apps.core.db import pool_stats
+
+    # open the pool up front, its warm up is not what is measured
+    connections["pooled"].pool.open(wait=True)
+    try:
+        run("direct", "direct", args.requests, args.threads)
+        run("pooled", "pooled", args.requests, args.threads)
+        stats = pool_stats()["pooled"]
+        print(
+            f"pool: {stats.get('requests_num', 0)} requests, "
+            f"{stats.get('requests_queued', 0)} queued, "
+            f"{stats.get('requests_wait_ms', 0)} ms waited in total, "
+            f"{stats['requests_wait_avg_ms']} ms on average"
+        )
+    finally:
+        connections["pooled"].close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Email throughput: one SMTP session per message vs the pooled connection
+used by `apps.core.tasks` (see `apps.core.mail.PooledEmailConnection`).
+
+Runs against a local aiosmtpd stand-in, no real mail is sent:
+
+    pip install aiosmtpd
+    python benchmarks/email_throughput.py --messages 500 --handshake-delay 20
+
+`--handshake-delay` (ms) is added to every EHLO to approximate the network
+round trips and TLS handshake of a real provider.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class Handler:
+    def __init__(self, handshake_delay: float):
+        self.handshake_delay = handshake_delay
+        self.sessions = 0
+        self.messages = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 OK"
+
+
+def run(label, send, messages, handler) -> None:
+    handler.sessions = handler.messages = 0
+    started = time.perf_counter()
+    for i in range(messages):
+        send(f"Subject {i}")
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<12} {messages / elapsed:8.1f} msg/s  "
+        f"{elapsed / messages * 1000:7.2f} ms/msg  "
+        f"{handler.sessions:5d} SMTP sessions"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--handshake-delay", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    from aiosmtpd.controller import Controller
+
+    settings.configure(
+        EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+        EMAIL_HOST="127.0.0.1",
+        EMAIL_PORT=args.port,
+        EMAIL_USE_TLS=False,
+        EMAIL_CONNECTION_IDLE_TIMEOUT=60,
+        EMAIL_CONNECTION_KEEPALIVE_INTERVAL=15,
+    )
+    django.setup()
+
+    from django.core.mail import send_mail
+
+    from apps.core.mail import PooledEmailConnection
+
+    handler = Handler(args.handshake_delay / 1000)
+    controller = Controller(handler, hostname="127.0.0.1", port=args.port)
+    controller.start()
+
+    pool = PooledEmailConnection(idle_timeout=60, keepalive_interval=15)
+    try:
+        run(
+            "per-message",
+            lambda subject: send_mail(subject, "body", "a@a.com", ["b@b.com"]),
+            args.messages,
+            handler,
+        )
+        run(
+            "pooled",
+            lambda subject: send_mail(
+                subject, "body", "a@a.com", ["b@b.com"], connection=pool
+            ),
+            args.messages,
+            handler,
+        )
+    finally:
+        pool.close()
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
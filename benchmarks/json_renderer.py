@@ -0,0 +1,116 @@
+"""
+Rendering task list pages: DRF's `JSONRenderer` vs the orjson backed
+`apps.core.renderers.FastJSONRenderer`, plus parsing a request body with
+`JSONParser` vs `FastJSONParser`.
+
+Pages are `TaskSerializer` data of in-memory tasks, no database is needed:
+
+    python benchmarks/json_renderer.py --page-size 100 --pages 200
+
+Both renderers are checked to produce the same bytes before timing them.
+"""
+
+import argparse
+import io
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def page(size: int):
+    from django.utils import timezone
+    from rest_framework.utils.serializer_helpers import ReturnDict
+
+    from apps.tasks.models import Task
+    from apps.tasks.serializers import TaskSerializer
+
+    now = timezone.now()
+    tasks = [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet, consectetur. " * 20,
+            price=Decimal("150.00") + i,
+            deadline=now + timedelta(days=i),
+            client_id=i,
+            freelancer_id=i if i % 2 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(size)
+    ]
+    return ReturnDict(
+        {
+            "count": 10_000,
+            "next": "http://localhost/api/v1/tasks/?limit=100&offset=100",
+            "previous": None,
+            "results": TaskSerializer(tasks, many=True).data,
+        },
+        serializer=None,
+    )
+
+
+def run(label, func, repeat) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<16} {elapsed * 1000:8.3f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "django.contrib.postgres",
+            "rest_framework",
+            "apps.core",
+            "apps.users",
+            "apps.tasks",
+        ],
+        AUTH_USER_MODEL="users.User",
+        USE_TZ=True,
+    )
+    django.setup()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.core.parsers import FastJSONParser
+    from apps.core.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        sys.exit("orjson is not installed, FastJSONRenderer is JSONRenderer")
+
+    data = page(args.page_size)
+    body = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == body
+    print(f"page of {args.page_size} tasks, {len(body) / 1024:.1f} KiB")
+
+    drf = run("render drf", lambda: JSONRenderer().render(data), args.pages)
+    fast = run("render orjson", lambda: FastJSONRenderer().render(data), args.pages)
+    print(f"{'':<16} {drf / fast:8.1f}x")
+
+    drf = run("parse drf", lambda: JSONParser().parse(io.BytesIO(body)), args.pages)
+    fast = run(
+        "parse orjson", lambda: FastJSONParser().parse(io.BytesIO(body)), args.pages
+    )
+    print(f"{'':<16} {drf / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
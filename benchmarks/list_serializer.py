@@ -0,0 +1,136 @@
+"""
+Per-row cost of task list pages: model instances through `TaskListSerializer`
+vs `values_list()` rows through `apps.core.serializers.ValuesRepresentation`.
+
+Both sides start from the raw rows the database returns. The model path
+hydrates them with `Task.from_db`, like the ORM does, no database is needed:
+
+    python benchmarks/list_serializer.py --page-sizes 10 100 1000
+
+Both outputs are checked to render to the same bytes before timing them.
+"""
+
+import argparse
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def rows(size: int) -> list[dict]:
+    from django.utils import timezone
+
+    now = timezone.now()
+    return [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "description_snippet": "Lorem ipsum dolor sit amet. " * 10,
+            "price": Decimal("150.00") + i,
+            "deadline": now + timedelta(days=i),
+            "status": "open",
+            "client_id": i,
+            "freelancer_id": i if i % 2 else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(size)
+    ]
+
+
+def timed(func, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rows", type=int, default=20_000, help="rows per size")
+    args = parser.parse_args()
+
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "django.contrib.postgres",
+            "rest_framework",
+            "apps.core",
+            "apps.users",
+            "apps.tasks",
+        ],
+        AUTH_USER_MODEL="users.User",
+        USE_TZ=True,
+    )
+    django.setup()
+
+    from django.db.models.functions import Left
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.core.serializers import ValuesRepresentation
+    from apps.tasks.models import Task
+    from apps.tasks.serializers import LIST_DESCRIPTION_LENGTH, TaskListSerializer
+
+    queryset = Task.objects.annotate(
+        description_snippet=Left("description", LIST_DESCRIPTION_LENGTH)
+    )
+    serializer = TaskListSerializer(context={"request": None})
+    representation = ValuesRepresentation.compile(serializer, queryset)
+    # the columns the ORM reads for a list, by attname, in model order
+    attnames = [
+        field.attname
+        for field in Task._meta.concrete_fields
+        if field.name in representation.columns
+    ]
+
+    def instances(page):
+        # what the ORM does for every row of a list: hydrate a model instance
+        # and set the annotations on it
+        tasks = []
+        for row in page:
+            task = Task.from_db("default", attnames, row[:-1])
+            task.description_snippet = row[-1]
+            tasks.append(task)
+        return tasks
+
+    print(f"{'rows':>6} {'serializer':>14} {'values':>14} {'speedup':>8}")
+    for size in args.page_sizes:
+        data = rows(size)
+        model_rows = [
+            (*(row[name] for name in attnames), row["description_snippet"])
+            for row in data
+        ]
+        values_rows = [
+            tuple(
+                row.get(column, row.get(f"{column}_id"))
+                for column in representation.columns
+            )
+            for row in data
+        ]
+        expected = JSONRenderer().render(
+            TaskListSerializer(instances(model_rows), many=True).data
+        )
+        rendered = JSONRenderer().render(representation.to_representation(values_rows))
+        assert rendered == expected
+
+        repeat = max(1, args.rows // size)
+        slow = timed(
+            lambda: TaskListSerializer(instances(model_rows), many=True).data, repeat
+        )
+        fast = timed(lambda: representation.to_representation(values_rows), repeat)
+        print(
+            f"{size:>6} {slow / size * 1e6:11.2f} us {fast / size * 1e6:11.2f} us "
+            f"{slow / fast:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
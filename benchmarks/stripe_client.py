@@ -0,0 +1,132 @@
+"""
+Stripe API calls: a new client per call, as `StripeService` used to build,
+vs the shared keep-alive client of `apps.payments.client.get_stripe_client`.
+
+Runs against a local HTTP stand-in of the checkout sessions endpoint, nothing
+is sent to Stripe:
+
+    python benchmarks/stripe_client.py --calls 300 --handshake-delay 30
+
+`--handshake-delay` (ms) is added to every new connection to approximate the
+TCP and TLS handshakes with the real API, `--latency` (ms) to every request.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handshake_delay: float, latency: float):
+        super().__init__(address, Handler)
+        self.handshake_delay = handshake_delay
+        self.latency = latency
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, don't let them wait for an ACK
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake_delay)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        body = json.dumps(
+            {
+                "id": "cs_test",
+                "object": "checkout.session",
+                "url": "https://checkout.stripe.com/c/pay/cs_test",
+                "expires_at": int(time.time()) + 86400,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_session(client) -> None:
+    client.v1.checkout.sessions.create(
+        params={
+            "mode": "payment",
+            "line_items": [{"price": "price_test", "quantity": 1}],
+        }
+    )
+
+
+def run(label, get_client, calls, server) -> None:
+    server.connections = 0
+    started = time.perf_counter()
+    for _ in range(calls):
+        create_session(get_client())
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<12} {calls / elapsed:8.1f} calls/s  "
+        f"{elapsed / calls * 1000:7.2f} ms/call  "
+        f"{server.connections:5d} connections"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--handshake-delay", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=12111)
+    args = parser.parse_args()
+
+    settings.configure(
+        STRIPE_SECRET_KEY="sk_test_benchmark",
+        STRIPE_API_BASE=f"http://127.0.0.1:{args.port}",
+        STRIPE_CONNECT_TIMEOUT=5,
+        STRIPE_READ_TIMEOUT=30,
+        STRIPE_MAX_NETWORK_RETRIES=0,
+        STRIPE_POOL_SIZE=10,
+    )
+    django.setup()
+
+    from apps.payments.client import get_stripe_client
+
+    server = StandIn(
+        ("127.0.0.1", args.port), args.handshake_delay / 1000, args.latency / 1000
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def fresh_client():
+        get_stripe_client.cache_clear()
+        return get_stripe_client()
+
+    try:
+        run("per-call", fresh_client, args.calls, server)
+        get_stripe_client.cache_clear()
+        run("shared", get_stripe_client, args.calls, server)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
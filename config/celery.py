@@ -2,6 +2,7 @@ import os
 from datetime import timedelta
 
 from celery import Celery
+from decouple import config
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
@@ -9,9 +10,19 @@ app = Celery("config")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
+# seconds between two runs of `expire_due_tasks`, how late a task may expire
+TASK_DEADLINES_TICK = config("TASK_DEADLINES_TICK", cast=float, default=5)
+
 app.conf.beat_schedule = {
+    "expire_due_tasks": {
+        "task": "apps.tasks.tasks.expire_due_tasks",
+        "schedule": timedelta(seconds=TASK_DEADLINES_TICK),
+        # a late run is superseded by the next one
+        "options": {"expires": TASK_DEADLINES_TICK},
+    },
+    # safety net for the tasks the deadline scheduler missed
     "expire_tasks_by_interval": {
         "task": "apps.tasks.tasks.expire_tasks",
         "schedule": timedelta(hours=1),
-    }
+    },
 }
@@ -60,8 +60,10 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
+    "apps.core",
     "apps.users",
     "apps.tasks",
     "apps.proposals",
@@ -75,6 +77,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.middleware.ReplicaPinningMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -99,6 +102,17 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
+# one psycopg connection pool per process, sizes are per process too
+DB_POOL = config("DB_POOL", default=True, cast=bool)
+DB_POOL_OPTIONS = {
+    "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+    "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+    # seconds
+    "max_lifetime": config("DB_POOL_MAX_LIFETIME", default=3600, cast=float),
+    "max_idle": config("DB_POOL_MAX_IDLE", default=600, cast=float),
+    "timeout": config("DB_POOL_TIMEOUT", default=10, cast=float),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -107,9 +121,48 @@ DATABASES = {
         "PASSWORD": config("DB_PASS"),
         "HOST": config("DB_HOST"),
         "PORT": config("DB_PORT"),
+        # pooled connections are returned after every request instead, the
+        # pool doesn't allow persistent ones
+        "CONN_MAX_AGE": (
+            0 if DB_POOL else config("DB_CONN_MAX_AGE", default=0, cast=int)
+        ),
+        # connections are checked before being handed out
+        "CONN_HEALTH_CHECKS": config("DB_HEALTH_CHECKS", default=True, cast=bool),
+        "OPTIONS": {"pool": DB_POOL_OPTIONS} if DB_POOL else {},
     }
 }
 
+# read replicas as host or host:port, with the credentials of the primary
+DATABASE_REPLICAS = []
+for number, address in enumerate(config("DB_REPLICAS", default="", cast=Csv()), 1):
+    host, _, port = address.partition(":")
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+
+DATABASE_ROUTERS = ["apps.core.routers.ReplicaRouter"]
+# seconds a user's reads stay on the primary after they wrote something
+DB_REPLICA_PIN_SECONDS = config("DB_REPLICA_PIN_SECONDS", default=5, cast=float)
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("CACHE_URL", default="redis://redis:6379/2"),
+    }
+}
+# seconds an anonymous task list response is cached (see apps.tasks.cache)
+TASK_LIST_CACHE_TIMEOUT = config("TASK_LIST_CACHE_TIMEOUT", cast=int, default=60)
+# redis holding upcoming task deadlines (see apps.tasks.deadlines), empty to
+# only expire tasks with the hourly sweep
+TASK_DEADLINES_REDIS_URL = config(
+    "TASK_DEADLINES_REDIS_URL", default=CACHES["default"]["LOCATION"]
+)
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -152,6 +205,17 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    # orjson backed when it is installed, DRF's own JSON renderer and parser
+    # otherwise
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
@@ -168,6 +232,13 @@ EMAIL_USE_SSL = config("EMAIL_USE_SSL", cast=bool, default=False)
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default=EMAIL_HOST_USER)
+# pooled connection used by email tasks (see apps.core.mail), in seconds
+EMAIL_CONNECTION_IDLE_TIMEOUT = config(
+    "EMAIL_CONNECTION_IDLE_TIMEOUT", cast=float, default=60
+)
+EMAIL_CONNECTION_KEEPALIVE_INTERVAL = config(
+    "EMAIL_CONNECTION_KEEPALIVE_INTERVAL", cast=float, default=15
+)
 
 
 SPECTACULAR_SETTINGS = {
@@ -194,3 +265,9 @@ CELERY_TASK_SERIALIZER = "json"
 STRIPE_SECRET_KEY = config("STRIPE_SECRET_KEY")
 STRIPE_PUBLIC_KEY = config("STRIPE_PUBLIC_KEY")
 STRIPE_WEBHOOK_SECRET = config("STRIPE_WEBHOOK_SECRET")
+# empty for the Stripe API, or the base url of a stand-in
+STRIPE_API_BASE = config("STRIPE_API_BASE", default="")
+STRIPE_CONNECT_TIMEOUT = config("STRIPE_CONNECT_TIMEOUT", default=5, cast=float)
+STRIPE_READ_TIMEOUT = config("STRIPE_READ_TIMEOUT", default=30, cast=float)
+STRIPE_MAX_NETWORK_RETRIES = config("STRIPE_MAX_NETWORK_RETRIES", default=2, cast=int)
+STRIPE_POOL_SIZE = config("STRIPE_POOL_SIZE", default=10, cast=int)
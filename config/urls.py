@@ -19,6 +19,7 @@ urlpatterns = [
     path("api/v1/users/", include("apps.users.urls", namespace="users")),
     path("api/v1/tasks/", include("apps.tasks.urls", namespace="tasks")),
     path("api/v1/payments/", include("apps.payments.urls", namespace="payments")),
+    path("api/v1/core/", include("apps.core.urls", namespace="core")),
 ]
 
 if settings.DEBUG:
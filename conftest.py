@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from apps.payments.models import Payment
@@ -10,6 +11,13 @@ from apps.tasks.models import Task
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # test transactions are rolled back without running on_commit
+    # invalidations, so cached entries must not leak between tests
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()